@@ -1,5 +1,5 @@
 # LLM Adapters
-from .base import LLMAdapter, ReviewResult, Severity, Issue
+from .base import LLMAdapter, ReviewResult, Severity, Issue, run_all
 from .gemini import GeminiAdapter
 from .copilot import CopilotAdapter
 from .claude_self import ClaudeSelfAdapter
@@ -9,6 +9,7 @@ __all__ = [
     "ReviewResult",
     "Severity",
     "Issue",
+    "run_all",
     "GeminiAdapter",
     "CopilotAdapter",
     "ClaudeSelfAdapter"
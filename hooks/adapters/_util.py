@@ -0,0 +1,12 @@
+"""
+Shared adapter helpers
+"""
+import shutil
+from functools import lru_cache
+from typing import Optional
+
+
+@lru_cache(maxsize=8)
+def which(name: str) -> Optional[str]:
+    """shutil.which cached per process (CLI installs don't change mid-run)"""
+    return shutil.which(name)
@@ -1,12 +1,99 @@
 """
 LLM Adapter Base Class
 """
+import asyncio
+import json
+import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum
+from functools import total_ordering
 
+# orjson is optional (C-accelerated codec, works on bytes directly)
+try:
+    import orjson
 
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+# Fenced ```json { ... } ``` block in LLM responses
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
+# Response format instructions appended to every external review prompt
+_RESPONSE_FORMAT_BLOCK = """
+
+## Response Format
+You must respond in the following JSON format:
+```json
+{
+  "severity": "OK|LOW|MEDIUM|HIGH|CRITICAL",
+  "issues": [
+    {
+      "description": "Issue description",
+      "severity": "OK|LOW|MEDIUM|HIGH|CRITICAL",
+      "location": "file:line (optional)",
+      "suggestion": "Fix suggestion (optional)"
+    }
+  ]
+}
+```
+"""
+
+
+def _extract_json_block(response: str) -> Optional[str]:
+    """
+    Extract the first JSON object from a fenced code block
+
+    Scans once, counting braces outside of string literals, so nested
+    ``` fences inside JSON string values don't end the block early.
+    """
+    fence = response.find("```")
+    if fence == -1:
+        return None
+
+    pos = fence + 3
+    if response.startswith("json", pos):
+        pos += 4
+    while pos < len(response) and response[pos].isspace():
+        pos += 1
+    if pos >= len(response) or response[pos] != "{":
+        return None
+
+    start = pos
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(response)):
+        c = response[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return response[start:i + 1]
+    return None
+
+
+# Severity ordering (OK < LOW < MEDIUM < HIGH < CRITICAL)
+_SEVERITY_RANK = {"OK": 0, "LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
+
+
+@total_ordering
 class Severity(Enum):
     OK = "OK"
     LOW = "LOW"
@@ -22,19 +109,47 @@ class Severity(Enum):
             return cls.OK
 
     def __lt__(self, other):
-        order = [Severity.OK, Severity.LOW, Severity.MEDIUM, Severity.HIGH, Severity.CRITICAL]
-        return order.index(self) < order.index(other)
+        if not isinstance(other, Severity):
+            return NotImplemented
+        return _SEVERITY_RANK[self.value] < _SEVERITY_RANK[other.value]
+
 
+# Text-response severity keywords (highest priority first)
+_SEVERITY_KEYWORDS = [
+    (Severity.CRITICAL, ("critical", "security vulnerability")),
+    (Severity.HIGH, ("high", "bug", "error")),
+    (Severity.MEDIUM, ("medium", "improvement")),
+    (Severity.LOW, ("low", "minor", "trivial")),
+]
 
-@dataclass
+# Casefolded keyword -> (priority, severity)
+_KEYWORD_PRIORITY: Dict[str, Tuple[int, Severity]] = {
+    word: (priority, severity)
+    for priority, (severity, words) in enumerate(_SEVERITY_KEYWORDS)
+    for word in words
+}
+# ASCII-only case folding: with Unicode IGNORECASE, "crıtical" (dotless i)
+# or the Kelvin sign would match but miss the _KEYWORD_PRIORITY lookup
+_SEVERITY_RE = re.compile(
+    "|".join(re.escape(word) for word in _KEYWORD_PRIORITY),
+    re.IGNORECASE | re.ASCII
+)
+
+
+@dataclass(slots=True)
 class Issue:
     description: str
     severity: Severity
     location: Optional[str] = None
     suggestion: Optional[str] = None
+    # Plain-attribute copy of severity.value for serialization
+    _severity_value: str = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        self._severity_value = self.severity.value
 
-@dataclass
+
+@dataclass(slots=True)
 class ReviewResult:
     adapter_name: str
     severity: Severity
@@ -44,15 +159,20 @@ class ReviewResult:
     error: Optional[str] = None
     duration_ms: int = 0
     is_self_review: bool = False  # Whether this is Claude self review
+    # Plain-attribute copy of severity.value for serialization
+    _severity_value: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._severity_value = self.severity.value
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "adapter": self.adapter_name,
-            "severity": self.severity.value,
+            "severity": self._severity_value,
             "issues": [
                 {
                     "description": i.description,
-                    "severity": i.severity.value,
+                    "severity": i._severity_value,
                     "location": i.location,
                     "suggestion": i.suggestion
                 }
@@ -64,6 +184,20 @@ class ReviewResult:
             "is_self_review": self.is_self_review
         }
 
+    def to_audit_dict(self, max_text: int = 512) -> Dict[str, Any]:
+        """to_dict() with issue free-text fields capped at max_text chars
+
+        raw_response is left out, as in to_dict(). The text fallback puts
+        the whole response in description, so that field is capped too.
+        """
+        data = self.to_dict()
+        for issue in data["issues"]:
+            for key in ("description", "suggestion"):
+                text = issue[key]
+                if text and len(text) > max_text:
+                    issue[key] = text[:max_text] + "..."
+        return data
+
 
 class LLMAdapter(ABC):
     """LLM Adapter base interface"""
@@ -92,6 +226,27 @@ class LLMAdapter(ABC):
         """Check if adapter is available (CLI installation, etc.)"""
         pass
 
+    async def review_async(self, prompt: str, context: Dict[str, Any]) -> ReviewResult:
+        """Awaitable review (runs the blocking review in a worker thread)"""
+        return await asyncio.to_thread(self.review, prompt, context)
+
+    def _build_prompt(self, base_prompt: str, context: Dict[str, Any]) -> str:
+        """Generate prompt with context info"""
+        file_path = context.get("file_path")
+        diff = context.get("diff")
+        code = context.get("code")
+        user_request = context.get("user_request")
+
+        file_section = f"\n\n## File Path\n{file_path}" if file_path else ""
+        diff_section = f"\n\n## Changes\n```\n{diff}\n```" if diff else ""
+        code_section = f"\n\n## Code\n```\n{code}\n```" if code else ""
+        request_section = f"\n\n## User Request\n{user_request}" if user_request else ""
+
+        return (
+            f"{base_prompt}{file_section}{diff_section}{code_section}"
+            f"{request_section}{_RESPONSE_FORMAT_BLOCK}"
+        )
+
     def parse_response(self, response: str) -> ReviewResult:
         """
         Parse LLM response to create ReviewResult
@@ -109,16 +264,20 @@ class LLMAdapter(ABC):
             ]
         }
         """
-        import json
-        import re
-
         try:
-            # Try to extract JSON block
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response, re.DOTALL)
-            if json_match:
-                response = json_match.group(1)
+            # Direct JSON first (common case), fenced block second
+            try:
+                data = json_loads(response)
+            except json.JSONDecodeError:
+                block = _extract_json_block(response)
+                if block is None:
+                    json_match = _JSON_FENCE_RE.search(response)
+                    if not json_match:
+                        raise
+                    block = json_match.group(1)
+                response = block
+                data = json_loads(response)
 
-            data = json.loads(response)
             severity = Severity.from_string(data.get("severity", "OK"))
             issues = [
                 Issue(
@@ -144,18 +303,16 @@ class LLMAdapter(ABC):
 
     def _parse_text_response(self, response: str) -> ReviewResult:
         """Infer severity from text response"""
-        response_lower = response.lower()
-
-        if any(word in response_lower for word in ["critical", "security vulnerability"]):
-            severity = Severity.CRITICAL
-        elif any(word in response_lower for word in ["high", "bug", "error"]):
-            severity = Severity.HIGH
-        elif any(word in response_lower for word in ["medium", "improvement"]):
-            severity = Severity.MEDIUM
-        elif any(word in response_lower for word in ["low", "minor", "trivial"]):
-            severity = Severity.LOW
-        else:
-            severity = Severity.OK
+        # Single case-insensitive scan over the original text (no lowercased copy)
+        best_priority = len(_SEVERITY_KEYWORDS)
+        severity = Severity.OK
+        for match in _SEVERITY_RE.finditer(response):
+            priority, keyword_severity = _KEYWORD_PRIORITY[match.group(0).casefold()]
+            if priority < best_priority:
+                best_priority = priority
+                severity = keyword_severity
+                if priority == 0:
+                    break
 
         return ReviewResult(
             adapter_name=self.name,
@@ -164,3 +321,12 @@ class LLMAdapter(ABC):
             raw_response=response,
             success=True
         )
+
+
+async def run_all(
+    adapters: List[LLMAdapter], prompt: str, context: Dict[str, Any]
+) -> List[ReviewResult]:
+    """Run reviews on all available adapters concurrently"""
+    return list(await asyncio.gather(
+        *(adapter.review_async(prompt, context) for adapter in adapters if adapter.is_available())
+    ))
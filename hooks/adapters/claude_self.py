@@ -10,71 +10,11 @@ from typing import Dict, Any, List
 
 from .base import LLMAdapter, ReviewResult, Severity, Issue
 
+# Intent longer than this is cut before being embedded in the review message
+MAX_INTENT_CHARS = 3000
 
-class ClaudeSelfAdapter(LLMAdapter):
-    """
-    Claude Self Review Adapter v2
-
-    Features:
-    - Uses Task subagent (code-reviewer)
-    - Code review from perspective independent of main session
-    - Free, no quota limits
-    """
-
-    def __init__(self, config: Dict[str, Any]):
-        super().__init__("claude_self", config)
-        self.use_subagent = config.get("completion_review", {}).get("use_subagent", True)
-
-    def is_available(self) -> bool:
-        """Always available"""
-        return True
-
-    def review(self, prompt: str, context: Dict[str, Any]) -> ReviewResult:
-        """
-        Generate self review message
-
-        Note: Does not perform actual review, only generates message requesting Claude to review
-        """
-        _ = prompt  # unused but required by interface
-        message = self._build_self_review_message(context)
-
-        return ReviewResult(
-            adapter_name=self.name,
-            severity=Severity.OK,  # Self review doesn't judge severity
-            issues=[],
-            raw_response=message,
-            success=True,
-            is_self_review=True
-        )
-
-    def _build_self_review_message(self, context: Dict[str, Any]) -> str:
-        """Generate self review request message"""
-        todos = context.get("todos", [])
-        combined_intent = context.get("combined_intent", "")
-        original_request = context.get("original_request", "")
-        cwd = context.get("cwd", "")
-
-        todos_formatted = self._format_todos(todos)
-
-        # Use summary if original request is too long
-        intent_display = combined_intent if combined_intent else original_request
-        if len(intent_display) > 3000:
-            intent_display = intent_display[:3000] + "\n\n[...truncated...]"
-
-        if self.use_subagent:
-            return self._build_subagent_review_message(
-                intent_display, todos_formatted, cwd
-            )
-        else:
-            return self._build_simple_review_message(
-                intent_display, todos_formatted
-            )
-
-    def _build_subagent_review_message(
-        self, intent: str, todos: str, cwd: str
-    ) -> str:
-        """Generate review request message using subagent"""
-        return f"""## Task Complete - Subagent Code Review Request
+# Static review message templates (only the placeholders are filled per call)
+_SUBAGENT_REVIEW_TEMPLATE = """## Task Complete - Subagent Code Review Request
 
 All TODOs have been completed. **Run code-reviewer subagent via Task tool** to review code from an independent perspective.
 
@@ -87,7 +27,7 @@ prompt: |
   Please perform code review for the following task.
 
   ## User Request:
-  {intent[:1500]}
+  {intent}
 
   ## Completed Tasks:
   {todos}
@@ -104,9 +44,7 @@ prompt: |
 
 Please proceed with necessary fixes based on subagent review results."""
 
-    def _build_simple_review_message(self, intent: str, todos: str) -> str:
-        """Structured checklist-based self review (v3)"""
-        return f"""## Task Complete - Structured Self Review
+_SIMPLE_REVIEW_TEMPLATE = """## Task Complete - Structured Self Review
 
 All TODOs have been completed. **Review each item in the checklist below** and fix immediately if issues are found.
 
@@ -159,16 +97,83 @@ Fixes Needed: [proceed with fix immediately if any]
 
 **If issues are found, don't just report - proceed with fixes immediately.**"""
 
+
+class ClaudeSelfAdapter(LLMAdapter):
+    """
+    Claude Self Review Adapter v2
+
+    Features:
+    - Uses Task subagent (code-reviewer)
+    - Code review from perspective independent of main session
+    - Free, no quota limits
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__("claude_self", config)
+        self.use_subagent = config.get("completion_review", {}).get("use_subagent", True)
+
+    def is_available(self) -> bool:
+        """Always available"""
+        return True
+
+    def review(self, prompt: str, context: Dict[str, Any]) -> ReviewResult:
+        """
+        Generate self review message
+
+        Note: Does not perform actual review, only generates message requesting Claude to review
+        """
+        _ = prompt  # unused but required by interface
+        message = self._build_self_review_message(context)
+
+        return ReviewResult(
+            adapter_name=self.name,
+            severity=Severity.OK,  # Self review doesn't judge severity
+            issues=[],
+            raw_response=message,
+            success=True,
+            is_self_review=True
+        )
+
+    def _build_self_review_message(self, context: Dict[str, Any]) -> str:
+        """Generate self review request message"""
+        todos = context.get("todos", [])
+        combined_intent = context.get("combined_intent", "")
+        original_request = context.get("original_request", "")
+        cwd = context.get("cwd", "")
+
+        # Reuse the orchestrator's formatting pass when there is one
+        todos_formatted = (context.get("todos_formatted") if todos else None) or self._format_todos(todos)
+
+        # Use summary if original request is too long
+        intent_display = combined_intent or original_request
+        if len(intent_display) > MAX_INTENT_CHARS:
+            intent_display = f"{intent_display[:MAX_INTENT_CHARS]}\n\n[...truncated...]"
+
+        if self.use_subagent:
+            return self._build_subagent_review_message(
+                intent_display, todos_formatted, cwd
+            )
+        else:
+            return self._build_simple_review_message(
+                intent_display, todos_formatted
+            )
+
+    def _build_subagent_review_message(
+        self, intent: str, todos: str, cwd: str
+    ) -> str:
+        """Generate review request message using subagent"""
+        return _SUBAGENT_REVIEW_TEMPLATE.format(intent=intent[:1500], todos=todos, cwd=cwd)
+
+    def _build_simple_review_message(self, intent: str, todos: str) -> str:
+        """Structured checklist-based self review (v3)"""
+        return _SIMPLE_REVIEW_TEMPLATE.format(intent=intent, todos=todos)
+
     def _format_todos(self, todos: List[Dict[str, Any]]) -> str:
         """Format todo list"""
         if not todos:
             return "(none)"
 
-        lines = []
-        for i, todo in enumerate(todos, 1):
-            content = todo.get("content", "")
-            status = todo.get("status", "")
-            status_icon = "✅" if status == "completed" else "⏳"
-            lines.append(f"{i}. {status_icon} {content}")
-
-        return "\n".join(lines)
+        return "\n".join(
+            f"{i}. {'✅' if todo.get('status') == 'completed' else '⏳'} {todo.get('content', '')}"
+            for i, todo in enumerate(todos, 1)
+        )
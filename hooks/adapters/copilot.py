@@ -2,14 +2,21 @@
 GitHub Copilot CLI Adapter
 """
 import subprocess
+import sys
 import time
-import shutil
 import tempfile
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+from ._util import which
 from .base import LLMAdapter, ReviewResult, Severity
 
+# Largest prompt passed inline via argv (Linux caps a single argument at 128KiB).
+# On Windows copilot is a .cmd shim run through cmd.exe, which caps the command
+# line at 8191 chars and mangles newlines and quotes: prompts always go through
+# the temp file there
+MAX_INLINE_PROMPT_BYTES = 0 if sys.platform == "win32" else 120 * 1024
+
 
 class CopilotAdapter(LLMAdapter):
     """Review adapter using GitHub Copilot CLI"""
@@ -17,10 +24,13 @@ class CopilotAdapter(LLMAdapter):
     def __init__(self, config: Dict[str, Any]):
         super().__init__("copilot", config)
         # Search for copilot CLI path
-        self.cli_path = shutil.which("copilot")
+        self.cli_path = which("copilot")
+        self._available: Optional[bool] = None
 
     def is_available(self) -> bool:
-        return self.cli_path is not None
+        if self._available is None:
+            self._available = self.cli_path is not None
+        return self._available
 
     def review(self, prompt: str, context: Dict[str, Any]) -> ReviewResult:
         if not self.is_available():
@@ -39,21 +49,21 @@ class CopilotAdapter(LLMAdapter):
             # Include context in prompt
             full_prompt = self._build_prompt(prompt, context)
 
-            # Copilot CLI doesn't accept stdin directly, so use temp file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-                f.write(full_prompt)
-                temp_path = f.name
-
-            try:
-                # Call Copilot CLI (reference temp file containing the full prompt)
-                result = subprocess.run(
-                    [self.cli_path, "-p", f"Please review the contents of this file: {temp_path}"],
-                    capture_output=True,
-                    text=True,
-                    timeout=self.timeout
-                )
-            finally:
-                Path(temp_path).unlink(missing_ok=True)
+            # Copilot CLI doesn't accept stdin directly: pass the prompt inline,
+            # falling back to a temp file when it exceeds the argv limit (always on Windows)
+            prompt_bytes = full_prompt.encode("utf-8")
+            if len(prompt_bytes) <= MAX_INLINE_PROMPT_BYTES:
+                result = self._run_cli(full_prompt)
+            else:
+                with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as f:
+                    f.write(prompt_bytes)
+                    temp_path = f.name
+
+                try:
+                    # Reference temp file containing the full prompt
+                    result = self._run_cli(f"Please review the contents of this file: {temp_path}")
+                finally:
+                    Path(temp_path).unlink(missing_ok=True)
 
             duration_ms = int((time.time() - start_time) * 1000)
 
@@ -94,38 +104,11 @@ class CopilotAdapter(LLMAdapter):
                 duration_ms=int((time.time() - start_time) * 1000)
             )
 
-    def _build_prompt(self, base_prompt: str, context: Dict[str, Any]) -> str:
-        """Generate prompt with context info"""
-        parts = [base_prompt]
-
-        if context.get("file_path"):
-            parts.append(f"\n## File Path\n{context['file_path']}")
-
-        if context.get("diff"):
-            parts.append(f"\n## Changes\n```\n{context['diff']}\n```")
-
-        if context.get("code"):
-            parts.append(f"\n## Code\n```\n{context['code']}\n```")
-
-        if context.get("user_request"):
-            parts.append(f"\n## User Request\n{context['user_request']}")
-
-        parts.append("""
-## Response Format
-You must respond in the following JSON format:
-```json
-{
-  "severity": "OK|LOW|MEDIUM|HIGH|CRITICAL",
-  "issues": [
-    {
-      "description": "Issue description",
-      "severity": "OK|LOW|MEDIUM|HIGH|CRITICAL",
-      "location": "file:line (optional)",
-      "suggestion": "Fix suggestion (optional)"
-    }
-  ]
-}
-```
-""")
-
-        return "\n".join(parts)
+    def _run_cli(self, prompt_arg: str) -> subprocess.CompletedProcess:
+        """Call Copilot CLI in prompt mode"""
+        return subprocess.run(
+            [self.cli_path, "-p", prompt_arg],
+            capture_output=True,
+            text=True,
+            timeout=self.timeout
+        )
@@ -4,14 +4,14 @@ Gemini API Adapter (v2)
 - Free tier: 1500 requests/day
 - Model: gemini-2.5-flash-lite (fast and cheap)
 """
+import io
 import os
 import sys
 import ssl
 import time
-import json
-import shutil
 import subprocess
-import urllib.request
+import http.client
+import urllib.parse
 import urllib.error
 from typing import Dict, Any, Optional
 from pathlib import Path
@@ -23,7 +23,8 @@ try:
 except ImportError:
     HAS_CERTIFI = False
 
-from .base import LLMAdapter, ReviewResult, Severity
+from ._util import which
+from .base import LLMAdapter, ReviewResult, Severity, json_loads, json_dumps
 
 # Import API Key Loader (from parent directory)
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -54,13 +55,18 @@ class GeminiAdapter(LLMAdapter):
         self.model = gemini_config.get("model", self.DEFAULT_MODEL)
         self.use_api = gemini_config.get("use_api", True)
         # For CLI fallback
-        self.cli_path = shutil.which("gemini")
+        self.cli_path = which("gemini")
+        self._available: Optional[bool] = None
+
+        # Built once and reused so the TLS session survives across reviews
+        self._ssl_context = self._create_ssl_context()
+        self._connection: Optional[http.client.HTTPSConnection] = None
 
     def is_available(self) -> bool:
-        """Check if API key or CLI is available"""
-        if self.use_api and self.api_key:
-            return True
-        return self.cli_path is not None
+        """Check if API key or CLI is available (cached after first call)"""
+        if self._available is None:
+            self._available = bool(self.use_api and self.api_key) or self.cli_path is not None
+        return self._available
 
     def review(self, prompt: str, context: Dict[str, Any]) -> ReviewResult:
         if not self.is_available():
@@ -124,8 +130,6 @@ class GeminiAdapter(LLMAdapter):
 
     def _call_api(self, prompt: str) -> Optional[str]:
         """Call Gemini REST API directly"""
-        url = f"{self.API_BASE}/models/{self.model}:generateContent?key={self.api_key}"
-
         payload = {
             "contents": [{
                 "parts": [{"text": prompt}]
@@ -136,31 +140,75 @@ class GeminiAdapter(LLMAdapter):
             }
         }
 
-        data = json.dumps(payload).encode('utf-8')
-        req = urllib.request.Request(
-            url,
-            data=data,
-            headers={"Content-Type": "application/json"}
-        )
+        api_url = urllib.parse.urlsplit(self.API_BASE)
+        path = f"{api_url.path}/models/{self.model}:generateContent?key={self.api_key}"
+        data = json_dumps(payload)
+        headers = {"Content-Type": "application/json"}
+
+        for attempt in range(2):
+            connection = self._get_connection(api_url.netloc)
+            try:
+                connection.request("POST", path, body=data, headers=headers)
+                response = connection.getresponse()
+                body = self._read_body(response)
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # Server may have dropped an idle keep-alive connection: reconnect once
+                self._close_connection()
+                if attempt:
+                    raise
+            except Exception:
+                self._close_connection()
+                raise
+
+        if response.status >= 400:
+            raise urllib.error.HTTPError(
+                f"{self.API_BASE}/models/{self.model}:generateContent",
+                response.status, response.reason, response.headers, io.BytesIO(body)
+            )
 
-        # SSL context setup (fix macOS/Windows certificate issues)
+        result = json_loads(body)
+        # Gemini API response structure: candidates[0].content.parts[0].text
+        candidates = result.get("candidates", [])
+        if candidates:
+            parts = candidates[0].get("content", {}).get("parts", [])
+            if parts:
+                return parts[0].get("text", "")
+        return None
+
+    @staticmethod
+    def _read_body(response: http.client.HTTPResponse) -> bytearray:
+        """Read the whole body into one buffer sized from Content-Length"""
+        if response.length is None:
+            return bytearray(response.read())
+        body = bytearray(response.length)
+        read = response.readinto(body)
+        del body[read:]
+        return body
+
+    def _get_connection(self, host: str) -> http.client.HTTPSConnection:
+        """Return the cached keep-alive HTTPS connection"""
+        if self._connection is None:
+            self._connection = http.client.HTTPSConnection(
+                host, timeout=self.timeout, context=self._ssl_context
+            )
+        return self._connection
+
+    def _close_connection(self) -> None:
+        """Drop the cached connection (reopened on next call)"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @staticmethod
+    def _create_ssl_context() -> ssl.SSLContext:
+        """SSL context setup (fix macOS/Windows certificate issues)"""
         try:
             if HAS_CERTIFI:
-                ssl_context = ssl.create_default_context(cafile=certifi.where())
-            else:
-                ssl_context = ssl.create_default_context()
+                return ssl.create_default_context(cafile=certifi.where())
         except Exception:
-            ssl_context = ssl.create_default_context()
-
-        with urllib.request.urlopen(req, timeout=self.timeout, context=ssl_context) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            # Gemini API response structure: candidates[0].content.parts[0].text
-            candidates = result.get("candidates", [])
-            if candidates:
-                parts = candidates[0].get("content", {}).get("parts", [])
-                if parts:
-                    return parts[0].get("text", "")
-            return None
+            pass
+        return ssl.create_default_context()
 
     def _call_cli(self, prompt: str) -> Optional[str]:
         """Gemini CLI fallback"""
@@ -173,39 +221,3 @@ class GeminiAdapter(LLMAdapter):
         if result.returncode != 0:
             raise RuntimeError(f"CLI error: {result.stderr}")
         return result.stdout
-
-    def _build_prompt(self, base_prompt: str, context: Dict[str, Any]) -> str:
-        """Build prompt with context info"""
-        parts = [base_prompt]
-
-        if context.get("file_path"):
-            parts.append(f"\n## File Path\n{context['file_path']}")
-
-        if context.get("diff"):
-            parts.append(f"\n## Changes\n```\n{context['diff']}\n```")
-
-        if context.get("code"):
-            parts.append(f"\n## Code\n```\n{context['code']}\n```")
-
-        if context.get("user_request"):
-            parts.append(f"\n## User Request\n{context['user_request']}")
-
-        parts.append("""
-## Response Format
-You must respond in the following JSON format:
-```json
-{
-  "severity": "OK|LOW|MEDIUM|HIGH|CRITICAL",
-  "issues": [
-    {
-      "description": "Issue description",
-      "severity": "OK|LOW|MEDIUM|HIGH|CRITICAL",
-      "location": "file:line (optional)",
-      "suggestion": "Fix suggestion (optional)"
-    }
-  ]
-}
-```
-""")
-
-        return "\n".join(parts)
@@ -12,6 +12,8 @@ Called from /checkpoint skill via Bash tool:
 
 import sys
 import json
+import time
+import atexit
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -19,13 +21,19 @@ from typing import Dict, Any, Optional
 HOOKS_DIR = Path(__file__).parent
 LOG_FILE = HOOKS_DIR / "logs" / "checkpoint.log"
 
+# Line-buffered append handle, opened on first log() and kept for the process
+_log_fh = None
+
 
 def log(message: str):
     """Debug logging"""
+    global _log_fh
     try:
-        LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}\n")
+        if _log_fh is None:
+            LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+            _log_fh = open(LOG_FILE, "a", encoding="utf-8", buffering=1)
+            atexit.register(_log_fh.close)
+        _log_fh.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}\n")
     except Exception:
         pass
 
@@ -36,27 +44,13 @@ def get_current_session_id() -> str:
     from context_resilience import get_protected_context_manager
 
     manager = get_protected_context_manager()
-    sessions = manager.list_sessions()
-
-    if not sessions:
-        return f"checkpoint-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-
-    # Find most recent session
-    latest_session = None
-    latest_time = None
-
-    for session_id in sessions:
-        ctx = manager.load(session_id)
-        if ctx and ctx.updated_at:
-            try:
-                updated = datetime.fromisoformat(ctx.updated_at)
-                if latest_time is None or updated > latest_time:
-                    latest_time = updated
-                    latest_session = session_id
-            except ValueError:
-                pass
-
-    return latest_session or sessions[-1]
+    # Every save rewrites the context file, so its mtime tracks updated_at
+    timestamps = manager.list_session_timestamps()
+
+    if not timestamps:
+        return f"checkpoint-{time.strftime('%Y%m%d%H%M%S')}"
+
+    return max(timestamps, key=lambda t: t[1])[0]
 
 
 def create_checkpoint(message: str, session_id: Optional[str] = None) -> Dict[str, Any]:
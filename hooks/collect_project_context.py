@@ -1,20 +1,106 @@
 #!/usr/bin/env python3
 """Project context collector"""
+import os
 import sys
 import json
+import shutil
 import subprocess
 import re
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+VERSION_CACHE_FILE = Path("~/.claude/hooks/state/tool_versions.json").expanduser()
+# Cached probe outputs are re-checked after a day even if nothing in the key
+# changed (launchers can dispatch on state the key doesn't see), and only the
+# most recently checked entries are kept
+VERSION_CACHE_TTL_SEC = 24 * 3600
+MAX_VERSION_CACHE_ENTRIES = 64
+# Environment the launchers read to pick the real binary (macOS /usr/bin/java
+# dispatches on JAVA_HOME; wrapper scripts typically search PATH)
+_VERSION_ENV_VARS = ("JAVA_HOME", "PATH")
+# `java version "17.0.2"` / `openjdk version "21"`
+_JAVA_VERSION_RE = re.compile(r'version "([^"]+)"')
+# Version-manager shims (pyenv, rbenv, nodenv, jenv, asdf, mise, scoop keep
+# them in a "shims" directory; Volta links every tool to one launcher): the
+# shim file never changes when the selected version does
+_SHIM_DIR_NAME = "shims"
+_SHIM_BINARY_NAMES = frozenset({"volta-shim", "volta-shim.exe"})
+
 def get_command_output(cmd: list) -> str:
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=5,
-                                shell=(sys.platform == 'win32'))
+                                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
         return result.stdout.strip() if result.returncode == 0 else ""
     except Exception:
         return ""
 
+def load_version_cache() -> dict:
+    try:
+        return json.loads(VERSION_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def save_version_cache(cache: dict):
+    try:
+        VERSION_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        VERSION_CACHE_FILE.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+    except OSError:
+        pass
+
+def prune_version_cache(cache: dict, now: float):
+    """Drop expired entries, then all but the MAX_VERSION_CACHE_ENTRIES most recently checked"""
+    for slot, entry in list(cache.items()):
+        if not isinstance(entry, dict) or now - entry.get("checked_at", 0) > VERSION_CACHE_TTL_SEC:
+            del cache[slot]
+    if len(cache) > MAX_VERSION_CACHE_ENTRIES:
+        by_age = sorted(cache, key=lambda slot: cache[slot]["checked_at"], reverse=True)
+        for slot in by_age[MAX_VERSION_CACHE_ENTRIES:]:
+            del cache[slot]
+
+def is_version_shim(binary: str) -> bool:
+    """Whether binary is a version-manager shim (the version it runs depends on cwd/env)"""
+    real = os.path.realpath(binary)
+    return (
+        os.path.basename(os.path.dirname(binary)) == _SHIM_DIR_NAME
+        or os.path.basename(os.path.dirname(real)) == _SHIM_DIR_NAME
+        or os.path.basename(real) in _SHIM_BINARY_NAMES
+    )
+
+def get_tool_version(cmd: list, project_path: Path, cache: dict) -> str:
+    """Run a version probe, reusing the cached output while the binary and its environment are unchanged"""
+    binary = shutil.which(cmd[0])
+    if not binary:
+        return ""
+
+    # A shim's stat says nothing about the version behind it: always probe
+    if is_version_shim(binary):
+        return get_command_output([binary, *cmd[1:]])
+
+    real = os.path.realpath(binary)
+    try:
+        st = os.stat(real)
+    except OSError:
+        return ""
+
+    # Entries are per project (PATH, and so the binary found, can differ per directory)
+    slot = f"{cmd[0]}|{project_path}"
+    env = "\0".join(os.environ.get(name, "") for name in _VERSION_ENV_VARS)
+    env_hash = hashlib.blake2b(env.encode("utf-8", "surrogateescape"), digest_size=8).hexdigest()
+    binary_key = f"{real}:{st.st_mtime_ns}:{st.st_size}:{env_hash}"
+    now = time.time()
+    entry = cache.get(slot)
+    if (isinstance(entry, dict) and entry.get("key") == binary_key
+            and now - entry.get("checked_at", 0) <= VERSION_CACHE_TTL_SEC):
+        return entry.get("output", "")
+
+    output = get_command_output([binary, *cmd[1:]])
+    if output:
+        cache[slot] = {"key": binary_key, "output": output, "checked_at": now}
+    return output
+
 def main():
     project_dir = sys.argv[1] if len(sys.argv) > 1 else "."
     project_path = Path(project_dir).resolve()
@@ -25,27 +111,49 @@ def main():
 
     context = {}
 
-    java_out = get_command_output(["java", "-version"])
+    # One directory read instead of a stat per marker file
+    try:
+        with os.scandir(project_path) as it:
+            entries = {entry.name for entry in it}
+    except OSError:
+        entries = set()
+
+    # Version probes are independent subprocesses: run them concurrently
+    probes = {"java": ["java", "-version"]}
+    if "pyproject.toml" in entries or "requirements.txt" in entries:
+        probes["python"] = ["python", "--version"]
+    if "package.json" in entries:
+        probes["node"] = ["node", "--version"]
+
+    cache = load_version_cache()
+    before = dict(cache)
+    prune_version_cache(cache, time.time())
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        outputs = dict(zip(probes, executor.map(
+            lambda cmd: get_tool_version(cmd, project_path, cache), probes.values()
+        )))
+    if cache != before:
+        save_version_cache(cache)
+
+    java_out = outputs.get("java")
     if java_out:
-        match = re.search(r'"([^"]+)"', java_out)
+        match = _JAVA_VERSION_RE.search(java_out)
         if match:
             context["java_version"] = match.group(1)
 
-    if (project_path / "pyproject.toml").exists() or (project_path / "requirements.txt").exists():
-        py_ver = get_command_output(["python", "--version"])
-        if py_ver:
-            context["python_version"] = py_ver.replace("Python ", "")
+    py_ver = outputs.get("python")
+    if py_ver:
+        context["python_version"] = py_ver.replace("Python ", "")
 
-    if (project_path / "package.json").exists():
-        node_ver = get_command_output(["node", "--version"])
-        if node_ver:
-            context["node_version"] = node_ver
+    node_ver = outputs.get("node")
+    if node_ver:
+        context["node_version"] = node_ver
 
-    if (project_path / "src" / "main" / "java").exists():
+    if "src" in entries and os.path.exists(os.path.join(project_path, "src", "main", "java")):
         context["project_structure"] = "java-maven-gradle"
-    elif (project_path / "app").exists() and (project_path / "package.json").exists():
+    elif "app" in entries and "package.json" in entries:
         context["project_structure"] = "nextjs-or-node"
-    elif (project_path / "src").exists() and (project_path / "package.json").exists():
+    elif "src" in entries and "package.json" in entries:
         context["project_structure"] = "typescript-or-react"
     else:
         context["project_structure"] = "unknown"
@@ -6,42 +6,200 @@ Runs Claude self-review + external LLM review when all TODOs are completed
 Usage:
     echo '{"session_id": "...", "tool_input": {"todos": [...]}, ...}' | python completion_orchestrator.py
 """
+import io
 import sys
 import json
+import atexit
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
+from typing import Dict, Any, List, Optional, BinaryIO, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from datetime import datetime, timedelta
+
+# orjson is optional (C-accelerated codec for the per-hook JSON I/O)
+try:
+    import orjson
+
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def json_dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    def json_dumps_line(obj: Any) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+    json_loads = json.loads
 
 # Add module path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from adapters import GeminiAdapter, CopilotAdapter, ReviewResult
-from adapters.base import Severity
-from adapters.claude_self import ClaudeSelfAdapter
 from state_manager import get_state_manager
 from security import get_security_validator, load_config
 from todo_state_detector import TodoStateDetector
-from intent_extractor import IntentExtractor
-from quota_monitor import get_quota_monitor
-from debate_orchestrator import DebateOrchestrator
+
+# Review machinery is imported on first use: most invocations return
+# before any review runs (todos not just completed)
+if TYPE_CHECKING:
+    from adapters import ReviewResult
+    from adapters.base import LLMAdapter
+    from adapters.claude_self import ClaudeSelfAdapter
+    from debate_orchestrator import DebateOrchestrator, DebateRound
+    from intent_extractor import IntentExtractor
+    from quota_monitor import QuotaMonitor
+
+
+# Resolved once at import (hooks run per event)
+_CLAUDE_HOME = Path("~/.claude").expanduser()
+_LOG_DIR = _CLAUDE_HOME / "hooks" / "logs"
+_PROMPTS_DIR = _CLAUDE_HOME / "hooks" / "prompts"
+
+DEFAULT_REVIEW_PROMPT = """You are a senior software architect.
+Review the completion status and verify the following:
+1. Have all user requests been implemented?
+2. Are there any missing features or requirements?
+3. Were any unnecessary features added that weren't requested?
+
+Please respond in JSON format:
+{
+  "severity": "OK|LOW|MEDIUM|HIGH|CRITICAL",
+  "issues": [{"description": "...", "severity": "...", "suggestion": "..."}]
+}"""
+
+
+@lru_cache(maxsize=32)
+def load_prompt(prompt_name: str) -> str:
+    """Load prompt (cached; prompt files don't change during a run)"""
+    prompt_path = _PROMPTS_DIR / f"{prompt_name}.txt"
+    if prompt_path.exists():
+        return prompt_path.read_text(encoding="utf-8")
+
+    # Default prompt
+    return DEFAULT_REVIEW_PROMPT
 
 
 class AuditLogger:
-    """Audit log recording"""
+    """
+    Audit log recording (buffered, one open handle per daily file)
 
-    def __init__(self, log_dir: str = "~/.claude/hooks/logs"):
-        self.log_dir = Path(log_dir).expanduser()
-        self.log_dir.mkdir(parents=True, exist_ok=True)
+    log() only enqueues; a daemon thread writes the events so hook latency
+    doesn't depend on disk latency. Events must not be mutated after log().
+    """
 
-    def log(self, event: Dict[str, Any]):
-        today = datetime.now().strftime("%Y-%m-%d")
-        log_file = self.log_dir / f"completion-audit-{today}.jsonl"
+    BUFFER_SIZE = 64 * 1024
+    FLUSH_EVERY = 32  # events
+    FLUSH_INTERVAL_SEC = 0.25
+    CLOSE_TIMEOUT_SEC = 1.0
 
-        event["timestamp"] = datetime.now().isoformat()
+    _STOP = object()
 
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    def __init__(self, log_dir: Optional[str] = None, file_prefix: str = "completion-audit"):
+        self.log_dir = Path(log_dir).expanduser() if log_dir else _LOG_DIR
+        self.file_prefix = file_prefix
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._fh: Optional[BinaryIO] = None
+        self._fh_date: Optional[str] = None
+        # Date token cache: valid until the next local midnight
+        self._date_str = ""
+        self._date_expires = 0.0
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _today(self, ts: float) -> str:
+        """Local date string for ts (recomputed once per day)"""
+        if ts >= self._date_expires:
+            now = datetime.fromtimestamp(ts)
+            self._date_str = now.strftime("%Y-%m-%d")
+            midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+            self._date_expires = midnight.timestamp()
+        return self._date_str
+
+    def _get_handle(self, today: str) -> BinaryIO:
+        """Return the append handle for today's file (rotates on date change)"""
+        if self._fh is None or self._fh_date != today:
+            self._close_handle()
+            log_file = self.log_dir / f"{self.file_prefix}-{today}.jsonl"
+            self._fh = open(log_file, "ab", buffering=self.BUFFER_SIZE)
+            self._fh_date = today
+        return self._fh
+
+    def _ensure_writer(self):
+        """Start the writer thread on first use (most hooks never log)"""
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._drain, name="audit-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _drain(self):
+        """Writer thread: write queued events, flushing every N events or interval"""
+        pending = 0
+        while True:
+            try:
+                item = self._queue.get(timeout=self.FLUSH_INTERVAL_SEC) if pending else self._queue.get()
+            except queue.Empty:
+                self._flush_handle()
+                pending = 0
+                continue
+
+            if item is self._STOP:
+                break
+
+            today, event = item
+            try:
+                self._get_handle(today).write(json_dumps_line(event))
+            except (OSError, TypeError, ValueError):
+                # Audit is best effort: never take the writer down
+                continue
+            pending += 1
+            if pending >= self.FLUSH_EVERY:
+                self._flush_handle()
+                pending = 0
+
+        self._close_handle()
+
+    def log(self, event: Dict[str, Any]):
+        ts = time.time()
+        event["timestamp"] = datetime.fromtimestamp(ts).isoformat()
+
+        self._ensure_writer()
+        self._queue.put_nowait((self._today(ts), event))
+
+    def _flush_handle(self):
+        """Flush the open handle, if any (errors must not stop the writer)"""
+        if self._fh is not None:
+            try:
+                self._fh.flush()
+            except (OSError, ValueError):
+                pass
+
+    def _close_handle(self):
+        fh, self._fh = self._fh, None
+        if fh is not None:
+            try:
+                fh.close()
+            except (OSError, ValueError):
+                pass
+
+    def close(self):
+        """Drain queued events, flush and close the handle"""
+        with self._thread_lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put_nowait(self._STOP)
+        thread.join(timeout=self.CLOSE_TIMEOUT_SEC)
 
 
 class CompletionOrchestrator:
@@ -53,38 +211,68 @@ class CompletionOrchestrator:
         self.security = get_security_validator()
         self.audit_logger = AuditLogger()
         self.todo_detector = TodoStateDetector(self.state_manager)
-        self.intent_extractor = IntentExtractor()
-        self.quota_monitor = get_quota_monitor()
-        self.debate_orchestrator = DebateOrchestrator(self.config)
 
-        # Initialize adapters
-        self.self_adapter = ClaudeSelfAdapter(self.config)
-        self.external_adapters = self._init_external_adapters()
+    @cached_property
+    def raw_audit_logger(self) -> AuditLogger:
+        """Full-payload audit log (only created when audit_full_payloads is on)"""
+        return AuditLogger(file_prefix="completion-audit-raw")
+
+    @cached_property
+    def intent_extractor(self) -> 'IntentExtractor':
+        from intent_extractor import IntentExtractor
+        return IntentExtractor()
+
+    @cached_property
+    def quota_monitor(self) -> 'QuotaMonitor':
+        from quota_monitor import get_quota_monitor
+        return get_quota_monitor()
+
+    @cached_property
+    def debate_orchestrator(self) -> 'DebateOrchestrator':
+        from debate_orchestrator import DebateOrchestrator
+        return DebateOrchestrator(self.config)
+
+    @cached_property
+    def self_adapter(self) -> 'ClaudeSelfAdapter':
+        from adapters.claude_self import ClaudeSelfAdapter
+        return ClaudeSelfAdapter(self.config)
+
+    @cached_property
+    def external_adapters(self) -> List['LLMAdapter']:
+        return self._init_external_adapters()
 
     def _init_external_adapters(self) -> List:
         """Initialize external LLM adapters (with quota check)"""
-        adapters = []
         completion_config = self.config.get("completion_review", {})
 
         if not completion_config.get("include_external_review", True):
-            return adapters
+            return []
 
         enabled = self.config.get("enabled_adapters", ["gemini", "copilot"])
         # Filter only adapters with available quota
         available = self.quota_monitor.get_available_adapters(enabled)
+        names = [name for name in ("gemini", "copilot") if name in available]
 
-        if "gemini" in available:
-            adapter = GeminiAdapter(self.config)
-            if adapter.is_available():
-                adapters.append(adapter)
-
-        if "copilot" in available:
-            adapter = CopilotAdapter(self.config)
-            if adapter.is_available():
-                adapters.append(adapter)
+        adapters = []
+        if names:
+            # Submit every probe first, then collect (probes run concurrently)
+            with ThreadPoolExecutor(max_workers=len(names)) as executor:
+                futures = [executor.submit(self._probe_adapter, name) for name in names]
+                for future in futures:
+                    adapter = future.result()
+                    if adapter is not None:
+                        adapters.append(adapter)
 
         return adapters
 
+    def _probe_adapter(self, name: str) -> Optional['LLMAdapter']:
+        """Construct adapter and return it only if available"""
+        from adapters import GeminiAdapter, CopilotAdapter
+
+        adapter_class = GeminiAdapter if name == "gemini" else CopilotAdapter
+        adapter = adapter_class(self.config)
+        return adapter if adapter.is_available() else None
+
     def _build_context(self, hook_input: Dict[str, Any], todos: List[Dict]) -> Dict[str, Any]:
         """Build context"""
         transcript_path = hook_input.get("transcript_path")
@@ -97,33 +285,18 @@ class CompletionOrchestrator:
         return {
             "session_id": hook_input.get("session_id", "unknown"),
             "todos": todos,
+            # Formatted once, shared by every prompt built from this context
+            "todos_formatted": self._format_todos(todos),
             "combined_intent": intent_info.get("combined_intent", ""),
             "original_request": intent_info.get("original_request", ""),
             "message_count": intent_info.get("message_count", 0),
             "cwd": hook_input.get("cwd", "")
         }
 
-    def _load_prompt(self, prompt_name: str) -> str:
-        """Load prompt"""
-        prompt_path = Path("~/.claude/hooks/prompts").expanduser() / f"{prompt_name}.txt"
-        if prompt_path.exists():
-            return prompt_path.read_text(encoding="utf-8")
-
-        # Default prompt
-        return """You are a senior software architect.
-Review the completion status and verify the following:
-1. Have all user requests been implemented?
-2. Are there any missing features or requirements?
-3. Were any unnecessary features added that weren't requested?
-
-Please respond in JSON format:
-{
-  "severity": "OK|LOW|MEDIUM|HIGH|CRITICAL",
-  "issues": [{"description": "...", "severity": "...", "suggestion": "..."}]
-}"""
-
-    def _run_parallel_reviews(self, context: Dict[str, Any]) -> List[ReviewResult]:
+    def _run_parallel_reviews(self, context: Dict[str, Any]) -> List['ReviewResult']:
         """Run reviews in parallel (with quota monitoring)"""
+        from adapters.base import Severity
+
         results = []
         completion_config = self.config.get("completion_review", {})
 
@@ -133,11 +306,8 @@ Please respond in JSON format:
             results.append(self_result)
 
         # External LLM review (quota checked)
-        # Re-initialize adapters on each call (reflect quota status)
-        self.external_adapters = self._init_external_adapters()
-
         if self.external_adapters:
-            prompt = self._load_prompt("completion_external")
+            prompt = load_prompt("completion_external")
 
             full_prompt = f"""{prompt}
 
@@ -145,66 +315,123 @@ Please respond in JSON format:
 {context.get("combined_intent", "N/A")}
 
 ## Completed Task List:
-{self._format_todos(context.get("todos", []))}
+{context["todos_formatted"]}
 """
 
-            with ThreadPoolExecutor(max_workers=len(self.external_adapters)) as executor:
-                futures = {
-                    executor.submit(adapter.review, full_prompt, context): adapter
-                    for adapter in self.external_adapters
-                }
-                for future in as_completed(futures):
-                    adapter = futures[future]
-                    try:
-                        result = future.result()
-                        # Quota monitoring: record success/failure
-                        if result.success:
-                            self.quota_monitor.record_success(adapter.name)
-                        else:
-                            self.quota_monitor.record_failure(adapter.name, result.error or "Unknown error")
-                        results.append(result)
-                    except Exception as e:
-                        self.quota_monitor.record_failure(adapter.name, str(e))
-                        results.append(ReviewResult(
-                            adapter_name=adapter.name,
-                            severity=Severity.OK,
-                            issues=[],
-                            raw_response="",
-                            success=False,
-                            error=str(e)
-                        ))
+            short_circuit = completion_config.get("short_circuit_on_critical", True)
+            # Overall deadline for external reviews: a backstop for adapters
+            # that hang past their own timeout (timeout_seconds)
+            adapter_timeout = completion_config.get("adapter_timeout_sec", 90)
+            deadline = time.monotonic() + adapter_timeout
+
+            # Daemon threads, not a ThreadPoolExecutor: executor workers are
+            # joined at interpreter exit, so a review still running after the
+            # deadline (or a CRITICAL short-circuit) would hold the hook anyway
+            done_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+            for adapter in self.external_adapters:
+                threading.Thread(
+                    target=self._review_into,
+                    args=(adapter, full_prompt, context, done_queue),
+                    name=f"review-{adapter.name}",
+                    daemon=True
+                ).start()
+
+            pending = list(self.external_adapters)
+            critical_found = False
+            while pending and not critical_found:
+                try:
+                    adapter, result, error = done_queue.get(
+                        timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except queue.Empty:
+                    break  # Deadline reached
+                pending.remove(adapter)
+
+                if error is not None:
+                    self.quota_monitor.record_failure(adapter.name, str(error))
+                    results.append(self._failed_result(adapter.name, str(error)))
+                    continue
+
+                # Quota monitoring: record success/failure
+                if result.success:
+                    self.quota_monitor.record_success(adapter.name)
+                else:
+                    self.quota_monitor.record_failure(adapter.name, result.error or "Unknown error")
+                results.append(result)
+
+                # CRITICAL blocks regardless of the others: stop waiting on them
+                if short_circuit and result.success and result.severity == Severity.CRITICAL:
+                    critical_found = True
+
+            for adapter in pending:
+                if critical_found:
+                    # Abandoned by the short-circuit: recorded as skipped so
+                    # the adapter's quota status isn't penalized
+                    self.quota_monitor.record_skipped(adapter.name)
+                else:
+                    # Stragglers past the deadline: reported as timed out, but
+                    # recorded as skipped since the deadline is ours, not a
+                    # provider failure
+                    self.quota_monitor.record_skipped(adapter.name)
+                    results.append(self._failed_result(adapter.name, "timeout"))
 
         return results
 
+    @staticmethod
+    def _review_into(
+        adapter: 'LLMAdapter',
+        prompt: str,
+        context: Dict[str, Any],
+        done_queue: "queue.SimpleQueue"
+    ) -> None:
+        """Review thread body: put (adapter, result, error) on done_queue"""
+        try:
+            done_queue.put((adapter, adapter.review(prompt, context), None))
+        except Exception as e:
+            done_queue.put((adapter, None, e))
+
+    def _failed_result(self, adapter_name: str, error: str) -> 'ReviewResult':
+        """Placeholder result for an adapter that raised or timed out"""
+        from adapters import ReviewResult
+        from adapters.base import Severity
+
+        return ReviewResult(
+            adapter_name=adapter_name,
+            severity=Severity.OK,
+            issues=[],
+            raw_response="",
+            success=False,
+            error=error
+        )
+
     def _format_todos(self, todos: List[Dict]) -> str:
         """Format todo list"""
         if not todos:
             return "(None)"
 
-        lines = []
-        for i, todo in enumerate(todos, 1):
-            content = todo.get("content", "")
-            status = todo.get("status", "")
-            status_icon = "✅" if status == "completed" else "⏳"
-            lines.append(f"{i}. {status_icon} {content}")
-
-        return "\n".join(lines)
+        return "\n".join(
+            f"{i}. {'✅' if todo.get('status') == 'completed' else '⏳'} {todo.get('content', '')}"
+            for i, todo in enumerate(todos, 1)
+        )
 
     def _build_output(
         self,
-        results: List[ReviewResult],
+        results: List['ReviewResult'],
         context: Dict[str, Any],
         debate_result: Optional['DebateRound'] = None
     ) -> Dict[str, Any]:
         """Generate output (conditional block logic)"""
-        from debate_orchestrator import DebateRound  # For type hint
+        from adapters.base import Severity
 
-        messages = []
+        # Each message is written followed by "\n"; the last one is dropped
+        # at the end (same result as "\n".join of a message list)
+        buf = io.StringIO()
 
         # Self review message (request review from Claude)
         for r in results:
             if r.is_self_review:
-                messages.append(r.raw_response)
+                buf.write(r.raw_response)
+                buf.write("\n")
 
         # External LLM results
         external_results = [r for r in results if not r.is_self_review and r.success]
@@ -213,29 +440,29 @@ Please respond in JSON format:
         # If debate occurred, use debate result's severity
         if debate_result and debate_result.final_severity:
             final_severity = debate_result.final_severity
-            messages.append(self.debate_orchestrator.format_debate_result(debate_result))
+            buf.write(self.debate_orchestrator.format_debate_result(debate_result))
+            buf.write("\n")
         elif external_results:
             final_severity = max((r.severity for r in external_results), default=Severity.OK)
 
             if final_severity != Severity.OK:
-                messages.append(f"\n### External LLM Review Result ({final_severity.value}):")
+                buf.write(f"\n### External LLM Review Result ({final_severity.value}):\n")
                 for r in external_results:
                     if r.issues:
-                        messages.append(f"\n**{r.adapter_name}**:")
+                        buf.write(f"\n**{r.adapter_name}**:\n")
                         for issue in r.issues:
-                            messages.append(f"- [{issue.severity.value}] {issue.description}")
-                            if issue.suggestion:
-                                messages.append(f"  → Suggestion: {issue.suggestion}")
+                            suggestion = f"  → Suggestion: {issue.suggestion}\n" if issue.suggestion else ""
+                            buf.write(f"- [{issue.severity.value}] {issue.description}\n{suggestion}")
 
         # Conditional block: Only CRITICAL blocks, others just warn
         should_block = final_severity == Severity.CRITICAL
 
         if should_block:
-            messages.append("\n⛔ **CRITICAL issue found**: Task blocked. Please resolve the above issues and try again.")
+            buf.write("\n⛔ **CRITICAL issue found**: Task blocked. Please resolve the above issues and try again.\n")
 
         return {
             "continue": not should_block,
-            "systemMessage": "\n".join(messages)
+            "systemMessage": buf.getvalue()[:-1]
         }
 
     def orchestrate(self, hook_input: Dict[str, Any]) -> Dict[str, Any]:
@@ -282,11 +509,13 @@ Please respond in JSON format:
             needs_debate, reason = self.debate_orchestrator.needs_debate(external_results)
 
             if needs_debate:
-                # Run debate
+                # Only adapters that answered: abandoned (timed-out or
+                # short-circuited) reviews may still be running on theirs
+                responded = {r.adapter_name for r in external_results}
                 debate_result = self.debate_orchestrator.run_debate(
-                    adapters=self.external_adapters,
+                    adapters=[a for a in self.external_adapters if a.name in responded],
                     initial_results=external_results,
-                    original_prompt=self._load_prompt("completion_external"),
+                    original_prompt=load_prompt("completion_external"),
                     context=context
                 )
 
@@ -301,7 +530,7 @@ Please respond in JSON format:
             "review_count": review_count + 1,
             "todo_count": len(todos),
             "intent_length": len(context.get("combined_intent", "")),
-            "llm_results": [r.to_dict() for r in results if not r.is_self_review],
+            "llm_results": [r.to_audit_dict() for r in results if not r.is_self_review],
             "quota_status": self.quota_monitor.get_summary()
         }
 
@@ -316,6 +545,17 @@ Please respond in JSON format:
 
         self.audit_logger.log(audit_data)
 
+        # Full LLM payloads are for debugging only: separate file, opt-in
+        if self.config.get("logging", {}).get("audit_full_payloads", False):
+            self.raw_audit_logger.log({
+                "event_type": "completion_review_raw",
+                "session_id": session_id,
+                "llm_results": [
+                    {**r.to_dict(), "raw_response": r.raw_response}
+                    for r in results if not r.is_self_review
+                ]
+            })
+
         # 6. Generate output
         return self._build_output(results, context, debate_result)
 
@@ -323,9 +563,9 @@ Please respond in JSON format:
 def main():
     """CLI entrypoint"""
     try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
-        print(json.dumps({
+        input_data = json_loads(sys.stdin.buffer.read())
+    except ValueError:
+        print(json_dumps({
             "continue": True,
             "systemMessage": "[Completion Review] Input parsing failed"
         }))
@@ -334,7 +574,7 @@ def main():
     orchestrator = CompletionOrchestrator()
     result = orchestrator.orchestrate(input_data)
 
-    print(json.dumps(result, ensure_ascii=False))
+    print(json_dumps(result))
 
 
 if __name__ == "__main__":
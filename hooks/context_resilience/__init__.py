@@ -6,6 +6,7 @@ System to prevent context loss due to compaction
 from .protected_context import (
     ProtectedContext,
     ProtectedContextManager,
+    SessionMeta,
     get_protected_context_manager,
 )
 from .config import (
@@ -38,6 +39,7 @@ __all__ = [
     # Protected Context
     'ProtectedContext',
     'ProtectedContextManager',
+    'SessionMeta',
     'get_protected_context_manager',
     # Config
     'ContextResilienceConfig',
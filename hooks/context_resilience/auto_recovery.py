@@ -11,6 +11,7 @@ How it works:
 
 import os
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
@@ -26,6 +27,17 @@ from .semantic_anchors import (
 from .config import get_config, ContextResilienceConfig
 
 
+# Resolved once at import (hooks run per event)
+_CLAUDE_HOME = Path("~/.claude").expanduser()
+_GLOBAL_SKILLS_DIR = str(_CLAUDE_HOME / "skills")
+
+
+@lru_cache(maxsize=512)
+def _normalize_path(path: str) -> str:
+    """Normalize path (cached: resolve() walks every path component)"""
+    return str(Path(path).resolve()).lower()
+
+
 class AutoRecoveryEngine:
     """Auto recovery engine"""
 
@@ -43,43 +55,37 @@ class AutoRecoveryEngine:
         2. Prefer same working directory (if available)
         3. Only sessions with meaningful content
         """
-        sessions = self.manager.list_sessions()
-        if not sessions:
+        # Index summaries avoid loading every session's full context
+        index = self.manager.load_index()
+        if not index:
             return None
 
         cutoff = datetime.now() - timedelta(hours=max_age_hours)
         same_cwd_candidates = []
         other_candidates = []
+        normalized_cwd = _normalize_path(current_cwd) if current_cwd else None
 
-        for session_id in sessions:
-            context = self.manager.load(session_id)
-            if not context:
-                continue
-
+        for session_id, row in index.items():
             # Check update time
-            if not context.updated_at:
+            updated_at = row.get("updated_at")
+            if not updated_at:
                 continue
             try:
-                updated = datetime.fromisoformat(context.updated_at)
+                updated = datetime.fromisoformat(updated_at)
                 if updated < cutoff:
                     continue
-            except ValueError:
+            except (TypeError, ValueError):
                 continue
 
             # Check if there's meaningful content
-            has_meaningful_content = bool(
-                context.user_intent or
-                context.key_decisions or
-                context.pending_tasks or
-                context.active_files
-            )
-            if not has_meaningful_content:
+            if not row.get("has_meaningful_content"):
                 continue
 
             # Classify based on working directory match
-            candidate = (session_id, context, updated)
-            if current_cwd and context.working_directory:
-                if self._normalize_path(context.working_directory) == self._normalize_path(current_cwd):
+            working_directory = row.get("working_directory")
+            candidate = (session_id, updated)
+            if normalized_cwd and working_directory:
+                if _normalize_path(working_directory) == normalized_cwd:
                     same_cwd_candidates.append(candidate)
                 else:
                     other_candidates.append(candidate)
@@ -87,8 +93,8 @@ class AutoRecoveryEngine:
                 other_candidates.append(candidate)
 
         # Sort by updated_at descending (newest first)
-        same_cwd_candidates.sort(key=lambda x: x[2], reverse=True)
-        other_candidates.sort(key=lambda x: x[2], reverse=True)
+        same_cwd_candidates.sort(key=lambda x: x[1], reverse=True)
+        other_candidates.sort(key=lambda x: x[1], reverse=True)
 
         # Prefer same CWD session, otherwise other sessions
         if same_cwd_candidates:
@@ -97,28 +103,14 @@ class AutoRecoveryEngine:
             return other_candidates[0][0]
         return None
 
-    def _normalize_path(self, path: str) -> str:
-        """Normalize path"""
-        return str(Path(path).resolve()).lower()
-
     def should_recover(self, session_id: str) -> bool:
         """Check if recovery is needed"""
         if not self.config.enabled or not self.config.auto_recover:
             return False
 
-        context = self.manager.load(session_id)
-        if not context:
-            return False
-
         # Recovery only meaningful if there's minimal info
-        has_meaningful_content = bool(
-            context.user_intent or
-            context.key_decisions or
-            context.pending_tasks or
-            context.active_files
-        )
-
-        return has_meaningful_content
+        context = self.manager.load(session_id)
+        return bool(context and context.has_meaningful_content())
 
     def recover(self, session_id: str) -> Dict[str, Any]:
         """
@@ -127,25 +119,24 @@ class AutoRecoveryEngine:
         Returns:
             Deliver context to Claude in hookSpecificOutput format
         """
-        if not self.should_recover(session_id):
+        if not self.config.enabled or not self.config.auto_recover:
             return {"continue": True}
 
+        # Same check as should_recover(), on the context loaded once here
         context = self.manager.load(session_id)
-        if not context:
+        if not context or not context.has_meaningful_content():
             return {"continue": True}
 
-        # Generate recovery message
+        # Generate recovery message (+ anchor summary)
         message = self.manager.build_recovery_message(context)
-
-        # Add anchor summary
         anchors_summary = self.anchor_manager.build_anchors_summary(session_id, limit=10)
         if anchors_summary:
-            message += "\n\n" + anchors_summary
+            message = "\n\n".join((message, anchors_summary))
 
         # Length limit
         max_len = self.config.recovery_message_max_length
         if len(message) > max_len:
-            message = message[:max_len - 50] + "\n\n... (partially omitted)"
+            message = f"{message[:max_len - 50]}\n\n... (partially omitted)"
 
         return {
             "hookSpecificOutput": {
@@ -181,29 +172,27 @@ class AutoRecoveryEngine:
         1. ~/.claude/skills/
         2. {cwd}/.claude/skills/
         """
-        skills = []
-
         # Global skills
-        global_skills_dir = Path("~/.claude/skills").expanduser()
-        if global_skills_dir.exists():
-            for skill_dir in global_skills_dir.iterdir():
-                if skill_dir.is_dir():
-                    skill_md = skill_dir / "SKILL.md"
-                    if skill_md.exists():
-                        skills.append(str(skill_md))
+        skills = self._scan_skills_dir(_GLOBAL_SKILLS_DIR)
 
         # Project local skills
         if cwd:
-            local_skills_dir = Path(cwd) / ".claude" / "skills"
-            if local_skills_dir.exists():
-                for skill_dir in local_skills_dir.iterdir():
-                    if skill_dir.is_dir():
-                        skill_md = skill_dir / "SKILL.md"
-                        if skill_md.exists():
-                            skills.append(str(skill_md))
+            skills.extend(self._scan_skills_dir(os.path.join(cwd, ".claude", "skills")))
 
         return skills
 
+    @staticmethod
+    def _scan_skills_dir(skills_dir: str) -> List[str]:
+        """SKILL.md paths of the skill directories directly under skills_dir"""
+        try:
+            with os.scandir(skills_dir) as entries:
+                skill_dirs = [entry.path for entry in entries if entry.is_dir()]
+        except OSError:
+            return []
+
+        skill_files = (os.path.join(skill_dir, "SKILL.md") for skill_dir in skill_dirs)
+        return [skill_md for skill_md in skill_files if os.path.isfile(skill_md)]
+
     def initialize_session(self, session_id: str, cwd: str) -> Dict[str, Any]:
         """
         Initialize new session + recover previous session
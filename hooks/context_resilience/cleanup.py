@@ -4,37 +4,126 @@ Handles cleanup of session files, anchors, and memory data
 
 Cleanup targets:
 1. Expired session files (_protected.json)
-2. Expired anchor files (_anchors.json)
+2. Expired anchor files (_anchors.jsonl, legacy _anchors.json)
 3. TTL-exceeded memory data
-4. Empty directories
+4. Anchor count and memory size limits
+5. Empty directories
 
 Cleanup triggers:
 - Periodic execution from SessionStart hook
 - Manual cleanup command
 """
 
+import heapq
 import json
+import math
 import os
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from .config import get_config, CleanupConfig
+from .semantic_anchors import (
+    ANCHORS_SUFFIX,
+    LEGACY_ANCHORS_SUFFIX,
+    write_anchor_log,
+    parse_anchor_log,
+)
 
+# orjson is optional (faster parse/serialize of anchor and memory files)
+try:
+    import orjson
 
-@dataclass
+    _json_loads = orjson.loads
+
+    def _json_dumps(data) -> bytes:
+        return orjson.dumps(data)
+except ImportError:
+    _json_loads = json.loads
+    _ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    def _json_dumps(data) -> bytes:
+        return _ENCODER.encode(data).encode('utf-8')
+
+
+def _load_json_file(path: str):
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+
+def _write_json_file(path: str, data) -> None:
+    """Single-line output (indent=2 roughly doubles size and write cost)"""
+    with open(path, 'wb') as f:
+        f.write(_json_dumps(data))
+
+
+# State file name suffixes (matched on scandir names; no glob compilation)
+_PROTECTED_SUFFIX = "_protected.json"
+_ANCHORS_SUFFIXES = (ANCHORS_SUFFIX, LEGACY_ANCHORS_SUFFIX)
+_MEMORY_SCOPES = ('session', 'project', 'global')
+
+# TTL probe: memory files put "expiresAt" near the top, so a bounded prefix
+# read usually answers without decoding/parsing the whole file
+_EXPIRES_RE = re.compile(rb'"expiresAt"\s*:\s*"([^"]+)"')
+_EXPIRES_KEY = b'"expiresAt"'
+_PROBE_BYTES = 4096
+
+
+# Parsed .last_cleanup, keyed on (path, st_mtime_ns): repeated SessionStart
+# hooks then cost one stat instead of a read + parse
+_last_cleanup_cache: Optional[Tuple[str, int, datetime]] = None
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_ts(value: str) -> float:
+    """ISO timestamp -> epoch seconds (naive = local time); TTLs repeat a lot"""
+    return datetime.fromisoformat(value).timestamp()
+
+
+class _ExpiryClock:
+    """
+    'now' for TTL comparisons, computed once per cleanup pass
+
+    JS Date.toISOString() timestamps (YYYY-MM-DDTHH:MM:SS.sssZ) are fixed
+    width UTC, so they compare correctly as strings; anything else is
+    parsed (cached) to epoch seconds and compared as a float.
+    """
+
+    __slots__ = ('now_ts', 'now_zulu')
+
+    def __init__(self):
+        self.now_ts = time.time()
+        now_utc = datetime.fromtimestamp(self.now_ts, timezone.utc)
+        self.now_zulu = now_utc.strftime('%Y-%m-%dT%H:%M:%S.') + f"{now_utc.microsecond // 1000:03d}Z"
+
+    def is_expired(self, expires_at: str) -> bool:
+        if len(expires_at) == 24 and expires_at[-1] == 'Z' and expires_at[10] == 'T':
+            return expires_at < self.now_zulu
+        return _parse_iso_ts(expires_at) < self.now_ts
+
+
+@dataclass(slots=True)
 class CleanupResult:
     """Cleanup result"""
     sessions_deleted: int = 0
     anchors_deleted: int = 0
     memory_deleted: int = 0
     bytes_freed: int = 0
-    errors: List[str] = None
+    errors: List[str] = field(default_factory=list)
 
-    def __post_init__(self):
-        if self.errors is None:
-            self.errors = []
+    def __iadd__(self, other: 'CleanupResult') -> 'CleanupResult':
+        """Accumulate a partial result (e.g. from one cleanup step)"""
+        self.sessions_deleted += other.sessions_deleted
+        self.anchors_deleted += other.anchors_deleted
+        self.memory_deleted += other.memory_deleted
+        self.bytes_freed += other.bytes_freed
+        self.errors.extend(other.errors)
+        return self
 
 
 class DataCleanup:
@@ -43,51 +132,64 @@ class DataCleanup:
     STATE_DIR = Path("~/.claude/hooks/state").expanduser()
     MEMORY_DIR = Path("~/.cco/memory").expanduser()
     LAST_CLEANUP_FILE = Path("~/.claude/hooks/state/.last_cleanup").expanduser()
+    SIZE_HINT_MARGIN = 0.9  # Skip the enforce_limits walk below this share of the budget
 
     def __init__(self, config: Optional[CleanupConfig] = None):
         self.config = config or get_config().cleanup
+        # Plain string for os.path joins in per-file loops
+        self._state_dir = os.fspath(self.STATE_DIR)
+        # CleanupConfig is frozen: snapshot the derived limits once
+        self._retention_seconds = self.config.session_retention_days * 86400
+        self._max_anchors = self.config.max_anchors_per_session
+        self._max_memory_bytes = self.config.max_memory_size_mb * 1024 * 1024
+        self._cleanup_interval = timedelta(hours=self.config.cleanup_interval_hours)
 
     def should_run(self) -> bool:
         """Check if cleanup should run"""
         if not self.config.enabled:
             return False
 
-        # Check last cleanup time
-        if not self.LAST_CLEANUP_FILE.exists():
-            return True
-
+        # Check last cleanup time (missing file -> OSError -> run)
         try:
-            last_cleanup = datetime.fromisoformat(
-                self.LAST_CLEANUP_FILE.read_text().strip()
-            )
-            interval = timedelta(hours=self.config.cleanup_interval_hours)
-            return datetime.now() - last_cleanup > interval
+            last_cleanup = self._get_last_cleanup_time()
         except (ValueError, OSError):
             return True
+        return datetime.now() - last_cleanup > self._cleanup_interval
+
+    def _get_last_cleanup_time(self) -> datetime:
+        """Parsed .last_cleanup (re-read only when its mtime changes)"""
+        global _last_cleanup_cache
+        path = os.fspath(self.LAST_CLEANUP_FILE)
+        mtime_ns = os.stat(path).st_mtime_ns
+        cached = _last_cleanup_cache
+        if cached is not None and cached[0] == path and cached[1] == mtime_ns:
+            return cached[2]
+        with open(path, encoding='utf-8') as f:
+            last_cleanup = datetime.fromisoformat(f.read().strip())
+        _last_cleanup_cache = (path, mtime_ns, last_cleanup)
+        return last_cleanup
 
     def run(self, force: bool = False) -> CleanupResult:
         """Execute full cleanup"""
         if not force and not self.should_run():
             return CleanupResult()
 
-        result = CleanupResult()
+        # 1-2. Sessions first: session cleanup also removes the session's anchors
+        result = self._cleanup_state_files()
 
-        # 1. Cleanup session files
-        session_result = self.cleanup_sessions()
-        result.sessions_deleted = session_result[0]
-        result.bytes_freed += session_result[1]
+        # 3. Cleanup memory
+        memory_deleted, memory_freed = self.cleanup_memory()
+        result += CleanupResult(memory_deleted=memory_deleted, bytes_freed=memory_freed)
 
-        # 2. Cleanup anchor files
-        anchor_result = self.cleanup_anchors()
-        result.anchors_deleted = anchor_result[0]
-        result.bytes_freed += anchor_result[1]
+        # Keep the size hint in step with what was just freed
+        hint = self._read_size_hint()
+        if hint is not None and result.bytes_freed:
+            self._write_size_hint(max(0, hint[0] - result.bytes_freed), hint[1])
 
-        # 3. Cleanup memory files
-        memory_result = self.cleanup_memory()
-        result.memory_deleted = memory_result[0]
-        result.bytes_freed += memory_result[1]
+        # 4. Enforce anchor count and memory size limits
+        result += self.enforce_limits()
 
-        # 4. Cleanup empty directories
+        # 5. Cleanup empty directories (only after files are gone)
         self.cleanup_empty_dirs()
 
         # Record last cleanup time
@@ -95,140 +197,206 @@ class DataCleanup:
 
         return result
 
+    def _cleanup_state_files(self) -> CleanupResult:
+        """Session files, then the remaining expired anchor files"""
+        sessions_deleted, sessions_freed = self.cleanup_sessions()
+        anchors_deleted, anchors_freed = self.cleanup_anchors()
+        return CleanupResult(
+            sessions_deleted=sessions_deleted,
+            anchors_deleted=anchors_deleted,
+            bytes_freed=sessions_freed + anchors_freed,
+        )
+
     def cleanup_sessions(self) -> Tuple[int, int]:
         """Delete expired session files"""
-        deleted = 0
-        freed = 0
-
-        if not self.STATE_DIR.exists():
-            return (deleted, freed)
+        # No exists() pre-check: a missing dir just scans as empty
+        cutoff_ts = self._retention_cutoff_ts()
 
-        cutoff = datetime.now() - timedelta(days=self.config.session_retention_days)
+        expired = self._select_expired(self._scan_files(self.STATE_DIR, _PROTECTED_SUFFIX), cutoff_ts)
 
-        for f in self.STATE_DIR.glob("*_protected.json"):
-            try:
-                mtime = datetime.fromtimestamp(f.stat().st_mtime)
-                if mtime < cutoff:
-                    size = f.stat().st_size
-                    f.unlink()
-                    freed += size
-                    deleted += 1
-
-                    # Delete related files too
-                    session_id = f.stem.replace("_protected", "")
-                    self._delete_related_files(session_id)
-            except OSError:
-                pass
-
-        return (deleted, freed)
+        # Delete related files too
+        return self._delete_state_files(
+            expired, lambda name: self._related_file_names(name[:-len(_PROTECTED_SUFFIX)])
+        )
 
     def cleanup_anchors(self) -> Tuple[int, int]:
         """Delete expired anchor files"""
+        cutoff_ts = self._retention_cutoff_ts()
+
+        expired = self._select_expired(self._scan_files(self.STATE_DIR, _ANCHORS_SUFFIXES), cutoff_ts)
+
+        # Delete lock file too
+        return self._delete_state_files(expired, lambda name: (name.rsplit(".", 1)[0] + ".lock",))
+
+    def _delete_state_files(
+        self,
+        expired: List[Tuple[str, int]],
+        related: Callable[[str], Tuple[str, ...]]
+    ) -> Tuple[int, int]:
+        """Unlink (name, size) state files and their related files; returns (deleted, freed)"""
         deleted = 0
         freed = 0
 
-        if not self.STATE_DIR.exists():
-            return (deleted, freed)
-
-        cutoff = datetime.now() - timedelta(days=self.config.session_retention_days)
+        with self._open_dir_fd(self.STATE_DIR) as dir_fd:
+            for name, size in expired:
+                try:
+                    self._unlink_name(name, dir_fd)
+                except OSError:
+                    continue
+                freed += size
+                deleted += 1
 
-        for f in self.STATE_DIR.glob("*_anchors.json"):
-            try:
-                mtime = datetime.fromtimestamp(f.stat().st_mtime)
-                if mtime < cutoff:
-                    size = f.stat().st_size
-                    f.unlink()
-                    freed += size
-                    deleted += 1
-
-                    # Delete lock file too
-                    lock_file = f.with_suffix('.lock')
-                    if lock_file.exists():
-                        lock_file.unlink()
-            except OSError:
-                pass
+                for related_name in related(name):
+                    try:
+                        self._unlink_name(related_name, dir_fd)
+                    except OSError:
+                        pass
 
         return (deleted, freed)
 
     def cleanup_memory(self) -> Tuple[int, int]:
         """Delete expired memory files"""
-        deleted = 0
-        freed = 0
-
-        if not self.MEMORY_DIR.exists():
-            return (deleted, freed)
-
-        for scope in ['session', 'project', 'global']:
-            scope_dir = self.MEMORY_DIR / scope
-            if not scope_dir.exists():
-                continue
+        entries = []
+        for scope in _MEMORY_SCOPES:
+            entries.extend(self._walk_json_files(self.MEMORY_DIR / scope))
 
-            result = self._cleanup_memory_dir(scope_dir)
-            deleted += result[0]
-            freed += result[1]
+        return self._expire_memory_files(entries)
 
-        return (deleted, freed)
-
-    def _cleanup_memory_dir(self, dir_path: Path) -> Tuple[int, int]:
-        """Cleanup files in memory directory"""
+    def _expire_memory_files(self, entries: List[os.DirEntry]) -> Tuple[int, int]:
+        """Delete the expired files among entries"""
         deleted = 0
         freed = 0
+        clock = _ExpiryClock()
 
-        for item in dir_path.iterdir():
-            if item.is_dir():
-                result = self._cleanup_memory_dir(item)
-                deleted += result[0]
-                freed += result[1]
-            elif item.suffix == '.json' and not item.name.startswith('_'):
-                try:
-                    content = json.loads(item.read_text(encoding='utf-8'))
-                    expires_at = content.get('expiresAt')
-
-                    if expires_at:
-                        if datetime.fromisoformat(expires_at) < datetime.now():
-                            size = item.stat().st_size
-                            item.unlink()
-                            freed += size
-                            deleted += 1
-                except (json.JSONDecodeError, OSError, ValueError):
-                    pass
+        for entry in entries:
+            try:
+                expires_at = self._read_expires_at(entry.path)
+
+                if expires_at:
+                    if clock.is_expired(expires_at):
+                        size = entry.stat().st_size
+                        os.unlink(entry.path)
+                        freed += size
+                        deleted += 1
+            except (json.JSONDecodeError, OSError, ValueError, AttributeError):
+                pass
 
         return (deleted, freed)
 
+    @staticmethod
+    def _read_expires_at(path: str) -> Optional[str]:
+        """expiresAt of a memory file (prefix probe, full parse only on a miss)"""
+        with open(path, 'rb') as f:
+            head = f.read(_PROBE_BYTES)
+            match = _EXPIRES_RE.search(head)
+            if match:
+                return match.group(1).decode('utf-8')
+            if len(head) < _PROBE_BYTES and _EXPIRES_KEY not in head:
+                return None  # Whole file seen, no TTL
+            content = _json_loads(head + f.read())
+        return content.get('expiresAt')
+
     def cleanup_empty_dirs(self) -> int:
         """Delete empty directories"""
         removed = 0
 
         for base_dir in [self.STATE_DIR, self.MEMORY_DIR]:
-            if not base_dir.exists():
-                continue
-
-            for dir_path in sorted(base_dir.rglob("*"), reverse=True):
-                if dir_path.is_dir():
+            base = os.fspath(base_dir)
+            # Bottom-up walk: children come before parents, no sort needed.
+            # Listings are taken before children are removed, so track them.
+            removed_dirs = set()
+
+            for dirpath, dirnames, filenames in os.walk(base, topdown=False):
+                if dirpath == base or filenames:
+                    continue
+                if all(os.path.join(dirpath, d) in removed_dirs for d in dirnames):
                     try:
-                        if not any(dir_path.iterdir()):
-                            dir_path.rmdir()
-                            removed += 1
+                        os.rmdir(dirpath)
+                        removed_dirs.add(dirpath)
+                        removed += 1
                     except OSError:
                         pass
 
         return removed
 
-    def _delete_related_files(self, session_id: str) -> None:
-        """Delete session-related files"""
-        patterns = [
-            f"{session_id}_anchors.json",
+    @staticmethod
+    def _scan_files(dir_path: Path, suffix: Union[str, Tuple[str, ...]]) -> List[os.DirEntry]:
+        """Files in dir_path ending with suffix, a str or tuple (DirEntry caches stat per run)"""
+        try:
+            with os.scandir(dir_path) as it:
+                return [e for e in it if e.name.endswith(suffix) and e.is_file(follow_symlinks=False)]
+        except OSError:
+            return []
+
+    @staticmethod
+    def _walk_json_files(dir_path) -> List[os.DirEntry]:
+        """Recursive non-underscore *.json files under dir_path"""
+        found = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        found.extend(DataCleanup._walk_json_files(entry.path))
+                    elif entry.name.endswith('.json') and not entry.name.startswith('_'):
+                        found.append(entry)
+        except OSError:
+            pass
+        return found
+
+    def _retention_cutoff_ts(self) -> float:
+        """Epoch seconds before which session/anchor files are expired"""
+        return time.time() - self._retention_seconds
+
+    @staticmethod
+    def _select_expired(entries: List[os.DirEntry], cutoff_ts: float) -> List[Tuple[str, int]]:
+        """(name, size) of entries last modified before cutoff_ts"""
+        expired = []
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if st.st_mtime < cutoff_ts:
+                expired.append((entry.name, st.st_size))
+        return expired
+
+    @staticmethod
+    @contextmanager
+    def _open_dir_fd(dir_path: Path):
+        """
+        Directory fd for unlinkat-style deletes (None where unsupported)
+
+        Unlinking by name relative to one open directory skips the per-call
+        path lookup of the state dir for every deleted file.
+        """
+        fd = None
+        if os.unlink in os.supports_dir_fd:
+            try:
+                fd = os.open(dir_path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+            except OSError:
+                fd = None
+        try:
+            yield fd
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    def _unlink_name(self, name: str, dir_fd: Optional[int]) -> None:
+        """Unlink a file in the state directory"""
+        if dir_fd is None:
+            os.unlink(os.path.join(self._state_dir, name))
+        else:
+            os.unlink(name, dir_fd=dir_fd)
+
+    @staticmethod
+    def _related_file_names(session_id: str) -> Tuple[str, ...]:
+        """Session-related files in the state directory"""
+        return (
+            f"{session_id}{ANCHORS_SUFFIX}",
+            f"{session_id}{LEGACY_ANCHORS_SUFFIX}",
             f"{session_id}_anchors.lock",
             f"{session_id}_protected.lock",
-        ]
-
-        for pattern in patterns:
-            path = self.STATE_DIR / pattern
-            if path.exists():
-                try:
-                    path.unlink()
-                except OSError:
-                    pass
+        )
 
     def _save_last_cleanup_time(self) -> None:
         """Save last cleanup time"""
@@ -251,25 +419,20 @@ class DataCleanup:
             "total_size_bytes": 0,
         }
 
-        # Session file statistics
-        if self.STATE_DIR.exists():
-            for f in self.STATE_DIR.glob("*_protected.json"):
-                stats["sessions"]["count"] += 1
-                stats["sessions"]["size_bytes"] += f.stat().st_size
-
-            for f in self.STATE_DIR.glob("*_anchors.json"):
-                stats["anchors"]["count"] += 1
-                stats["anchors"]["size_bytes"] += f.stat().st_size
-
-        # Memory file statistics
-        if self.MEMORY_DIR.exists():
-            for scope in ['session', 'project', 'global']:
-                scope_dir = self.MEMORY_DIR / scope
-                if scope_dir.exists():
-                    for f in scope_dir.rglob("*.json"):
-                        if not f.name.startswith('_'):
-                            stats["memory"][scope]["count"] += 1
-                            stats["memory"][scope]["size_bytes"] += f.stat().st_size
+        # Session/anchor file statistics
+        stats.update(self._state_file_stats())
+
+        # Memory file statistics (sizes from the walk's cached DirEntry stats)
+        memory_dir = os.fspath(self.MEMORY_DIR)
+        for scope in _MEMORY_SCOPES:
+            count = size = 0
+            for entry in self._walk_json_files(os.path.join(memory_dir, scope)):
+                try:
+                    size += entry.stat().st_size
+                except OSError:
+                    continue  # Removed mid-walk
+                count += 1
+            stats["memory"][scope] = {"count": count, "size_bytes": size}
 
         # Total size
         stats["total_size_bytes"] = (
@@ -280,55 +443,150 @@ class DataCleanup:
 
         return stats
 
+    def _state_file_stats(self) -> Dict[str, Dict[str, int]]:
+        """Session/anchor file count and size (one scandir of the state dir)"""
+        stats = {
+            "sessions": {"count": 0, "size_bytes": 0},
+            "anchors": {"count": 0, "size_bytes": 0},
+        }
+        try:
+            with os.scandir(self.STATE_DIR) as it:
+                for entry in it:
+                    if entry.name.endswith(_PROTECTED_SUFFIX):
+                        bucket = stats["sessions"]
+                    elif entry.name.endswith(_ANCHORS_SUFFIXES):
+                        bucket = stats["anchors"]
+                    else:
+                        continue
+                    bucket["count"] += 1
+                    bucket["size_bytes"] += entry.stat().st_size
+        except OSError:
+            pass
+        return stats
+
+    def _collect_memory_inventory(self) -> Tuple[int, List[Tuple[str, float, int]]]:
+        """Total memory bytes and (path, mtime, size) per memory file, in one walk"""
+        total = 0
+        files = []
+        for scope in _MEMORY_SCOPES:
+            for entry in self._walk_json_files(self.MEMORY_DIR / scope):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                total += st.st_size
+                files.append((entry.path, st.st_mtime, st.st_size))
+        return (total, files)
+
     def enforce_limits(self) -> CleanupResult:
         """Enforce size/count limits"""
         result = CleanupResult()
 
         # Anchor count limit (per session)
-        if self.STATE_DIR.exists():
-            for f in self.STATE_DIR.glob("*_anchors.json"):
-                try:
-                    content = json.loads(f.read_text(encoding='utf-8'))
-                    if len(content) > self.config.max_anchors_per_session:
-                        # Delete from oldest (low importance first)
-                        content.sort(key=lambda a: (a.get('importance', 1), a.get('timestamp', '')))
-                        excess = len(content) - self.config.max_anchors_per_session
-                        content = content[excess:]
-                        f.write_text(json.dumps(content, indent=2, ensure_ascii=False))
-                        result.anchors_deleted += excess
-                except (json.JSONDecodeError, OSError):
-                    pass
-
-        # Memory size limit
-        stats = self.get_stats()
-        max_bytes = self.config.max_memory_size_mb * 1024 * 1024
-
-        if stats["total_size_bytes"] > max_bytes:
+        max_anchors = self._max_anchors
+        for entry in self._scan_files(self.STATE_DIR, _ANCHORS_SUFFIXES):
+            try:
+                is_log = entry.name.endswith(ANCHORS_SUFFIX)
+                with open(entry.path, 'rb') as f:
+                    raw = f.read()
+                if is_log:
+                    # A log never holds more anchors than lines: skip the parse
+                    if raw.count(b"\n") <= max_anchors:
+                        continue
+                    content = parse_anchor_log(raw)
+                else:
+                    content = _json_loads(raw)
+                if len(content) > max_anchors:
+                    # Delete from oldest (low importance first): keep the
+                    # max_anchors largest, in ascending order (index breaks
+                    # ties so the result matches a stable sort)
+                    kept = heapq.nlargest(
+                        max_anchors,
+                        enumerate(content),
+                        key=lambda ia: (ia[1].get('importance', 1), ia[1].get('timestamp', ''), ia[0])
+                    )
+                    excess = len(content) - max_anchors
+                    kept_anchors = [anchor for _, anchor in reversed(kept)]
+                    if is_log:
+                        write_anchor_log(entry.path, kept_anchors)
+                    else:
+                        _write_json_file(entry.path, kept_anchors)
+                    result.anchors_deleted += excess
+            except (ValueError, OSError):
+                pass
+
+        max_bytes = self._max_memory_bytes
+
+        # Size hint from the last walk: well under budget -> no walk needed
+        # (re-synced by a real walk at most once per cleanup interval)
+        hint = self._read_size_hint()
+        if hint is not None:
+            total_hint, synced_at = hint
+            if total_hint < max_bytes * self.SIZE_HINT_MARGIN and datetime.now() - synced_at < self._cleanup_interval:
+                return result
+
+        # Memory size limit (one walk feeds both the budget check and the LRU)
+        state_stats = self._state_file_stats()
+        memory_bytes, all_files = self._collect_memory_inventory()
+        total_size_bytes = (
+            state_stats["sessions"]["size_bytes"] +
+            state_stats["anchors"]["size_bytes"] +
+            memory_bytes
+        )
+
+        if total_size_bytes > max_bytes:
             # Delete LRU style (oldest files first)
-            all_files = []
+            target = total_size_bytes * 0.8  # Reduce to 80%
+            current = total_size_bytes
+
+            # Only the oldest few files are usually needed: take the k oldest
+            # (O(n log k)) with k estimated from the average size, doubling
+            # k on the remainder if that wasn't enough
+            avg_size = memory_bytes / len(all_files) if all_files else 0
+            k = max(1, math.ceil((current - target) / avg_size) * 2) if avg_size else len(all_files)
+            remaining = all_files
+
+            while current > target and remaining:
+                victims = heapq.nsmallest(k, remaining, key=lambda x: x[1])  # By mtime
+                for file_path, _, size in victims:
+                    if current <= target:
+                        break
+                    try:
+                        os.unlink(file_path)
+                        current -= size
+                        result.memory_deleted += 1
+                        result.bytes_freed += size
+                    except OSError:
+                        pass
 
-            if self.MEMORY_DIR.exists():
-                for f in self.MEMORY_DIR.rglob("*.json"):
-                    if not f.name.startswith('_'):
-                        all_files.append((f, f.stat().st_mtime, f.stat().st_size))
+                if current > target:
+                    taken = set(victims)
+                    remaining = [f for f in remaining if f not in taken]
+                    k *= 2
 
-            all_files.sort(key=lambda x: x[1])  # Sort by mtime
+        self._write_size_hint(total_size_bytes - result.bytes_freed, datetime.now())
+        return result
 
-            target = stats["total_size_bytes"] * 0.8  # Reduce to 80%
-            current = stats["total_size_bytes"]
+    def _size_hint_path(self) -> Path:
+        return self.STATE_DIR / ".memory_size_hint"
 
-            for file_path, _, size in all_files:
-                if current <= target:
-                    break
-                try:
-                    file_path.unlink()
-                    current -= size
-                    result.memory_deleted += 1
-                    result.bytes_freed += size
-                except OSError:
-                    pass
+    def _read_size_hint(self) -> Optional[Tuple[int, datetime]]:
+        """(total_bytes, last walk time) from the size hint file"""
+        try:
+            data = _load_json_file(str(self._size_hint_path()))
+            return (int(data["total_bytes"]), datetime.fromisoformat(data["updated"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
 
-        return result
+    def _write_size_hint(self, total_bytes: int, synced_at: datetime) -> None:
+        """Persist the running total (synced_at = time of the last real walk)"""
+        try:
+            _write_json_file(
+                str(self._size_hint_path()),
+                {"total_bytes": total_bytes, "updated": synced_at.isoformat()}
+            )
+        except OSError:
+            pass
 
 
 # Convenience function
@@ -4,14 +4,15 @@ Config file loading and default value management
 """
 
 import json
-from dataclasses import dataclass, field
+import os
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CleanupConfig:
-    """Data cleanup settings"""
+    """Data cleanup settings (immutable: DataCleanup snapshots its fields)"""
     enabled: bool = True
     session_retention_days: int = 14  # 14 day retention
     max_anchors_per_session: int = 50
@@ -20,7 +21,7 @@ class CleanupConfig:
     cleanup_interval_hours: int = 24
 
 
-@dataclass
+@dataclass(slots=True)
 class AnchorDetectionConfig:
     """Anchor detection settings"""
     decision: bool = True
@@ -29,7 +30,7 @@ class AnchorDetectionConfig:
     file_modified: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextResilienceConfig:
     """Context Resilience overall settings"""
     enabled: bool = True
@@ -49,6 +50,14 @@ class ContextResilienceConfig:
     ])
 
 
+# Built once for save_config (json.dumps with kwargs constructs one per call)
+_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+# Top-level ContextResilienceConfig keys taken from the file as-is
+# (the nested sections are parsed into their own dataclasses)
+_CR_FIELDS = frozenset(f.name for f in fields(ContextResilienceConfig)) - {'anchor_detection', 'cleanup'}
+
+
 def load_config(config_path: str = "~/.claude/hooks/config.json") -> ContextResilienceConfig:
     """Load config file (use defaults if not exists)"""
     path = Path(config_path).expanduser()
@@ -69,18 +78,11 @@ def load_config(config_path: str = "~/.claude/hooks/config.json") -> ContextResi
             **cr_config.get("cleanup", {})
         ) if "cleanup" in cr_config else CleanupConfig()
 
+        # Missing keys fall back to the dataclass defaults
         return ContextResilienceConfig(
-            enabled=cr_config.get("enabled", True),
-            auto_save=cr_config.get("auto_save", True),
-            auto_recover=cr_config.get("auto_recover", True),
-            max_anchors=cr_config.get("max_anchors", 50),
-            recovery_message_max_length=cr_config.get("recovery_message_max_length", 2000),
             anchor_detection=anchor_config,
             cleanup=cleanup_config,
-            protected_fields=cr_config.get("protected_fields", [
-                "working_directory", "active_skills", "user_intent",
-                "key_decisions", "resolved_errors", "pending_tasks"
-            ])
+            **{k: v for k, v in cr_config.items() if k in _CR_FIELDS}
         )
     except (json.JSONDecodeError, KeyError):
         return ContextResilienceConfig()
@@ -123,26 +125,37 @@ def save_config(config: ContextResilienceConfig, config_path: str = "~/.claude/h
         "protected_fields": config.protected_fields,
     }
 
-    path.write_text(
-        json.dumps(existing, indent=2, ensure_ascii=False),
-        encoding='utf-8'
-    )
+    path.write_text(_ENCODER.encode(existing), encoding='utf-8')
+
 
+# Global config cache, keyed on the config file's mtime
+# (None = file missing, which is cached too)
+DEFAULT_CONFIG_PATH = Path("~/.claude/hooks/config.json").expanduser()
 
-# Global config cache
 _config: Optional[ContextResilienceConfig] = None
+_config_mtime_ns: Optional[int] = None
+
+
+def _stat_config_mtime_ns() -> Optional[int]:
+    try:
+        return os.stat(DEFAULT_CONFIG_PATH).st_mtime_ns
+    except OSError:
+        return None
 
 
 def get_config() -> ContextResilienceConfig:
-    """Return global config (cached)"""
-    global _config
-    if _config is None:
-        _config = load_config()
+    """Return global config (cached; re-parsed when the file changes)"""
+    global _config, _config_mtime_ns
+    mtime_ns = _stat_config_mtime_ns()
+    if _config is None or mtime_ns != _config_mtime_ns:
+        _config = load_config(str(DEFAULT_CONFIG_PATH))
+        _config_mtime_ns = mtime_ns
     return _config
 
 
 def reload_config() -> ContextResilienceConfig:
     """Reload config"""
-    global _config
-    _config = load_config()
+    global _config, _config_mtime_ns
+    _config_mtime_ns = _stat_config_mtime_ns()
+    _config = load_config(str(DEFAULT_CONFIG_PATH))
     return _config
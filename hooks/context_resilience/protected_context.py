@@ -3,25 +3,169 @@ Protected Context Manager
 Manage critical information that must not be lost even during compaction
 
 Storage location: ~/.claude/hooks/state/{session_id}_protected.json
+Session index: ~/.claude/hooks/state/_index.json
 """
 
 import json
-import hashlib
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
+import re
+import os
+import threading
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional, Set, Tuple
 
+# hashlib, datetime and filelock are imported where used: hook processes
+# that only read contexts never need them
+
+
+class _NoFileLock:
+    def __init__(self, path): pass
+    def __enter__(self): return self
+    def __exit__(self, *args): pass
+
+
+@lru_cache(maxsize=None)
+def _file_lock_class():
+    """filelock.FileLock, or a no-op lock when filelock is not installed"""
+    try:
+        from filelock import FileLock
+    except ImportError:
+        return _NoFileLock
+    return FileLock
+
+
+# orjson is optional (faster encode/decode of context and index files)
 try:
-    from filelock import FileLock
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(data, indent: bool = False) -> bytes:
+        # Dataclasses (ProtectedContext) are serialized natively, without asdict
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
 except ImportError:
-    class FileLock:
-        def __init__(self, path): pass
-        def __enter__(self): return self
-        def __exit__(self, *args): pass
+    _json_loads = json.loads  # No kwargs: reuses json's default decoder
+
+    # Encoders built once (json.dumps with kwargs constructs one per call)
+    _INDENT_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False, default=lambda obj: obj.to_dict())
+    _COMPACT_ENCODER = json.JSONEncoder(ensure_ascii=False, default=lambda obj: obj.to_dict())
+
+    def _json_dumps(data, indent: bool = False) -> bytes:
+        encoder = _INDENT_ENCODER if indent else _COMPACT_ENCODER
+        return encoder.encode(data).encode('utf-8')
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write via a temp file + os.replace: readers see the old or new file, never a partial one"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Context file name suffix (session_id = name[:-len(suffix)])
+_CONTEXT_SUFFIX = "_protected.json"
+_CONTEXT_SUFFIX_LEN = len(_CONTEXT_SUFFIX)
+
+
+# Partial-parse helpers for load_meta (top-level keys only)
+_WS_RE = re.compile(r'[ \t\n\r]*')
+_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_CONTAINER_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+_SCALAR_RE = re.compile(r'[^,}\]\s]+')
+_EMPTY_VALUE_RE = re.compile(r'""|\[[ \t\n\r]*\]|null|false')
+_DECODER = json.JSONDecoder()
+
+_META_FIELDS = frozenset({'session_id', 'working_directory', 'updated_at'})
+_CONTENT_FIELDS = frozenset({'user_intent', 'key_decisions', 'pending_tasks', 'active_files'})
+
+
+def _skip_value(text: str, pos: int) -> int:
+    """Return the index just past the JSON value starting at pos (no decoding)"""
+    char = text[pos:pos + 1]
+    if char == '"':
+        match = _STRING_RE.match(text, pos)
+        if not match:
+            raise ValueError(f"Unterminated string at {pos}")
+        return match.end()
+    if char in ('[', '{'):
+        depth = 0
+        for match in _CONTAINER_TOKEN_RE.finditer(text, pos):
+            token = match.group()
+            if token in ('[', '{'):
+                depth += 1
+            elif token in (']', '}'):
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        raise ValueError(f"Unterminated container at {pos}")
+    match = _SCALAR_RE.match(text, pos)
+    if not match:
+        raise ValueError(f"Expected value at {pos}")
+    return match.end()
+
+
+def _scan_meta(text: str) -> Dict[str, Any]:
+    """
+    Read only the summary fields from a serialized ProtectedContext
+
+    Meta fields are decoded; content fields are only checked for emptiness;
+    everything else is skipped without building Python objects.
+    """
+    meta: Dict[str, Any] = {'has_meaningful_content': False}
+    pos = _WS_RE.match(text, 0).end()
+    if text[pos:pos + 1] != '{':
+        raise ValueError("Expected object")
+    pos += 1
+
+    while True:
+        pos = _WS_RE.match(text, pos).end()
+        if text[pos:pos + 1] == '}':
+            return meta
+        key, pos = _DECODER.raw_decode(text, pos)
+        pos = _WS_RE.match(text, pos).end()
+        if text[pos:pos + 1] != ':':
+            raise ValueError(f"Expected ':' at {pos}")
+        pos = _WS_RE.match(text, pos + 1).end()
+
+        if key in _META_FIELDS:
+            meta[key], pos = _DECODER.raw_decode(text, pos)
+        else:
+            if key in _CONTENT_FIELDS and not _EMPTY_VALUE_RE.match(text, pos):
+                meta['has_meaningful_content'] = True
+            pos = _skip_value(text, pos)
+
+        # Everything needed is known: the rest of the file is irrelevant
+        if meta['has_meaningful_content'] and len(meta) > len(_META_FIELDS):
+            return meta
+
+        pos = _WS_RE.match(text, pos).end()
+        char = text[pos:pos + 1]
+        if char == ',':
+            pos += 1
+        elif char != '}':
+            raise ValueError(f"Expected ',' or '}}' at {pos}")
+
+
+@dataclass(slots=True)
+class SessionMeta:
+    """Summary of a session used for recovery candidate selection"""
+
+    session_id: str = ""
+    working_directory: str = ""
+    updated_at: str = ""
+    has_meaningful_content: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ProtectedContext:
     """Context information that must be protected"""
 
@@ -43,21 +187,80 @@ class ProtectedContext:
     updated_at: str = ""
     version: int = 1
 
+    # Membership index for list fields: name -> (list, len, set of items).
+    # Not serialized (orjson skips underscore fields; to_dict omits it).
+    _seen: Dict[str, Tuple[List[str], int, Set[str]]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Built by hand: asdict() deep-copies every list on each save.
+        # Lists are shared with the context, so treat the result as read-only.
+        return {
+            "session_id": self.session_id,
+            "working_directory": self.working_directory,
+            "active_skills": self.active_skills,
+            "claude_md_hash": self.claude_md_hash,
+            "user_intent": self.user_intent,
+            "key_decisions": self.key_decisions,
+            "active_files": self.active_files,
+            "resolved_errors": self.resolved_errors,
+            "pending_tasks": self.pending_tasks,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "version": self.version,
+        }
+
+    def copy(self) -> 'ProtectedContext':
+        """Copy with its own lists (the membership index is rebuilt on demand)"""
+        return ProtectedContext(
+            session_id=self.session_id,
+            working_directory=self.working_directory,
+            active_skills=list(self.active_skills),
+            claude_md_hash=self.claude_md_hash,
+            user_intent=self.user_intent,
+            key_decisions=list(self.key_decisions),
+            active_files=list(self.active_files),
+            resolved_errors=list(self.resolved_errors),
+            pending_tasks=list(self.pending_tasks),
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            version=self.version,
+        )
+
+    def has_meaningful_content(self) -> bool:
+        """Whether there is enough session info for recovery to be useful"""
+        return bool(
+            self.user_intent or
+            self.key_decisions or
+            self.pending_tasks or
+            self.active_files
+        )
+
+    def append_unique(self, name: str, value: str) -> None:
+        """Append value to list field name unless empty or already present (O(1) check)"""
+        items = getattr(self, name)
+        entry = self._seen.get(name)
+        # Rebuild when the list was replaced (e.g. trimmed on save) or changed elsewhere
+        if entry is None or entry[0] is not items or entry[1] != len(items):
+            seen = set(items)
+        else:
+            seen = entry[2]
+        if value and value not in seen:
+            items.append(value)
+            seen.add(value)
+        self._seen[name] = (items, len(items), seen)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ProtectedContext':
         # Extract only known fields
-        known_fields = {
-            'session_id', 'working_directory', 'active_skills', 'claude_md_hash',
-            'user_intent', 'key_decisions', 'active_files', 'resolved_errors',
-            'pending_tasks', 'created_at', 'updated_at', 'version'
-        }
-        filtered = {k: v for k, v in data.items() if k in known_fields}
+        filtered = {k: data[k] for k in _KNOWN_FIELDS if k in data}
         return cls(**filtered)
 
 
+_KNOWN_FIELDS = frozenset(f.name for f in fields(ProtectedContext) if not f.name.startswith('_'))
+
+
 class ProtectedContextManager:
     """Protected Context save/load management"""
 
@@ -67,16 +270,47 @@ class ProtectedContextManager:
     MAX_TASKS = 20
     MAX_CONTENT_LENGTH = 200  # Max length per item
 
-    def __init__(self, state_dir: str = "~/.claude/hooks/state"):
+    def __init__(self, state_dir: str = "~/.claude/hooks/state", use_file_lock: bool = True):
         self.state_dir = Path(state_dir).expanduser()
         self.state_dir.mkdir(parents=True, exist_ok=True)
 
+        # Every hook invocation is its own process, so writers must be
+        # serialized with the cross-process FileLock. use_file_lock=False
+        # (single-process tools and tests only) uses a per-session
+        # threading.Lock instead: no lockfile, no flock
+        self.use_file_lock = use_file_lock
+        self._session_locks: Dict[str, threading.Lock] = {}
+
+        # Last written context per session, reused by update() while the
+        # file's mtime is unchanged (saves a read + parse per update).
+        # Never handed out: callers get copies
+        self._cache: Dict[str, ProtectedContext] = {}
+        self._cache_mtime_ns: Dict[str, int] = {}
+
+        # CLAUDE.md path -> (st_mtime_ns, st_size, hash)
+        self._md_hash_cache: Dict[Path, Tuple[int, int, str]] = {}
+
     def _get_context_path(self, session_id: str) -> Path:
-        return self.state_dir / f"{session_id}_protected.json"
+        return self.state_dir / f"{session_id}{_CONTEXT_SUFFIX}"
 
     def _get_lock_path(self, session_id: str) -> Path:
         return self.state_dir / f"{session_id}_protected.lock"
 
+    def _lock_ctx(self, session_id: str):
+        """Lock guarding one session's context file"""
+        if self.use_file_lock:
+            return _file_lock_class()(str(self._get_lock_path(session_id)))
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = self._session_locks.setdefault(session_id, threading.Lock())
+        return lock
+
+    def _get_index_path(self) -> Path:
+        return self.state_dir / "_index.json"
+
+    def _get_index_lock_path(self) -> Path:
+        return self.state_dir / "_index.lock"
+
     def _truncate(self, text: str, max_len: int = None) -> str:
         """Limit text length"""
         max_len = max_len or self.MAX_CONTENT_LENGTH
@@ -86,23 +320,40 @@ class ProtectedContextManager:
 
     def _truncate_list(self, items: List[str], max_items: int) -> List[str]:
         """Limit list length (keep recent items)"""
-        truncated = [self._truncate(item) for item in items]
-        if len(truncated) > max_items:
-            return truncated[-max_items:]  # Keep recent items
-        return truncated
+        if len(items) > max_items:
+            items = items[-max_items:]  # Keep recent items
+        # Steady state: everything already fits, reuse the list as is
+        max_len = self.MAX_CONTENT_LENGTH
+        if all(len(item) <= max_len for item in items):
+            return items
+        return [self._truncate(item) for item in items]
 
     def load(self, session_id: str) -> Optional[ProtectedContext]:
         """Load Protected Context"""
+        with self._lock_ctx(session_id):
+            return self._read_context(session_id)
+
+    def _read_context(self, session_id: str) -> Optional[ProtectedContext]:
+        """Read a context file (caller holds the session lock)"""
+        path = self._get_context_path(session_id)
+        if not path.exists():
+            return None
+        try:
+            data = _json_loads(path.read_bytes())
+            return ProtectedContext.from_dict(data)
+        except (json.JSONDecodeError, KeyError, UnicodeDecodeError) as e:
+            return None
+
+    def load_meta(self, session_id: str) -> Optional[SessionMeta]:
+        """Load only the session summary (partial parse, no ProtectedContext)"""
         path = self._get_context_path(session_id)
-        lock_path = self._get_lock_path(session_id)
 
-        with FileLock(str(lock_path)):
+        with self._lock_ctx(session_id):
             if not path.exists():
                 return None
             try:
-                data = json.loads(path.read_text(encoding='utf-8'))
-                return ProtectedContext.from_dict(data)
-            except (json.JSONDecodeError, KeyError, UnicodeDecodeError) as e:
+                return SessionMeta(**_scan_meta(path.read_text(encoding='utf-8')))
+            except (ValueError, TypeError, UnicodeDecodeError):
                 return None
 
     def save(self, context: ProtectedContext) -> None:
@@ -110,8 +361,13 @@ class ProtectedContextManager:
         if not context.session_id:
             raise ValueError("session_id is required")
 
-        path = self._get_context_path(context.session_id)
-        lock_path = self._get_lock_path(context.session_id)
+        with self._lock_ctx(context.session_id):
+            mtime_ns = self._write_context(context)
+        self._after_write(context.copy(), mtime_ns)
+
+    def _write_context(self, context: ProtectedContext) -> int:
+        """Stamp, trim and write a context (caller holds the session lock); returns the file mtime"""
+        from datetime import datetime
 
         # Update timestamp
         now = datetime.now().isoformat()
@@ -119,61 +375,89 @@ class ProtectedContextManager:
             context.created_at = now
         context.updated_at = now
 
-        # Limit list sizes
-        context.key_decisions = self._truncate_list(
-            context.key_decisions, self.MAX_DECISIONS
-        )
-        context.active_files = self._truncate_list(
-            context.active_files, self.MAX_FILES
-        )
-        context.resolved_errors = self._truncate_list(
-            context.resolved_errors, self.MAX_ERRORS
-        )
-        context.pending_tasks = self._truncate_list(
-            context.pending_tasks, self.MAX_TASKS
-        )
-
-        with FileLock(str(lock_path)):
-            path.write_text(
-                json.dumps(context.to_dict(), indent=2, ensure_ascii=False),
-                encoding='utf-8'
-            )
+        # Limit list sizes (lists already within limits, the steady state,
+        # are left alone: no call, no new list)
+        max_len = self.MAX_CONTENT_LENGTH
+        for name, max_items in (
+            ("key_decisions", self.MAX_DECISIONS),
+            ("active_files", self.MAX_FILES),
+            ("resolved_errors", self.MAX_ERRORS),
+            ("pending_tasks", self.MAX_TASKS),
+        ):
+            items = getattr(context, name)
+            if len(items) > max_items or any(len(item) > max_len for item in items):
+                setattr(context, name, self._truncate_list(items, max_items))
 
-    def update(self, session_id: str, **updates) -> ProtectedContext:
-        """Update existing context (create new if not exists)"""
-        context = self.load(session_id) or ProtectedContext(session_id=session_id)
+        path = self._get_context_path(context.session_id)
+        _atomic_write(path, _json_dumps(context, indent=True))
+        return path.stat().st_mtime_ns
+
+    def _after_write(self, context: ProtectedContext, mtime_ns: int) -> None:
+        """Refresh the cache after a context was written"""
+        # The index is not touched here (rewriting it is O(all sessions));
+        # load_index/get_index_row rebuild the row from the new mtime.
+        # The saved context is now the up-to-date cached copy
+        self._cache[context.session_id] = context
+        self._cache_mtime_ns[context.session_id] = mtime_ns
+
+    def _cached_context(self, session_id: str) -> ProtectedContext:
+        """Context to apply updates to (caller holds the session lock); reloaded if the file changed on disk"""
+        context = self._cache.get(session_id)
+        try:
+            mtime_ns = self._get_context_path(session_id).stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if context is None or mtime_ns != self._cache_mtime_ns.get(session_id):
+            context = self._read_context(session_id) or ProtectedContext(session_id=session_id)
+        return context
 
+    def _update_locked(self, session_id: str, mutator: Callable[[ProtectedContext], None]) -> ProtectedContext:
+        """Apply mutator to the session's context and write it, under a single lock acquisition"""
+        with self._lock_ctx(session_id):
+            context = self._cached_context(session_id)
+            try:
+                mutator(context)
+                context.version += 1
+                mtime_ns = self._write_context(context)
+            except BaseException:
+                # The cached copy may be half-mutated: reload it next time
+                self._cache.pop(session_id, None)
+                self._cache_mtime_ns.pop(session_id, None)
+                raise
+
+        self._after_write(context, mtime_ns)
+        return context.copy()
+
+    @staticmethod
+    def _apply_updates(context: ProtectedContext, updates: Dict[str, Any]) -> None:
         for key, value in updates.items():
-            if hasattr(context, key):
+            if key in _KNOWN_FIELDS:
                 current = getattr(context, key)
 
-                # Append for list fields
+                # Append for list fields (only new items)
                 if isinstance(current, list) and not isinstance(value, list):
-                    if value and value not in current:
-                        current.append(value)
+                    context.append_unique(key, value)
                 elif isinstance(current, list) and isinstance(value, list):
-                    # Add only new items
                     for item in value:
-                        if item and item not in current:
-                            current.append(item)
+                        context.append_unique(key, item)
                 else:
                     setattr(context, key, value)
 
-        context.version += 1
-        self.save(context)
-        return context
+    def update(self, session_id: str, **updates) -> ProtectedContext:
+        """Update existing context (create new if not exists)"""
+        return self._update_locked(session_id, lambda context: self._apply_updates(context, updates))
 
     def add_decision(self, session_id: str, decision: str) -> None:
         """Add key decision"""
-        self.update(session_id, key_decisions=decision)
+        self._update_locked(session_id, lambda context: context.append_unique("key_decisions", decision))
 
     def add_active_file(self, session_id: str, file_path: str) -> None:
         """Add active file"""
-        self.update(session_id, active_files=file_path)
+        self._update_locked(session_id, lambda context: context.append_unique("active_files", file_path))
 
     def add_resolved_error(self, session_id: str, error: str) -> None:
         """Add resolved error"""
-        self.update(session_id, resolved_errors=error)
+        self._update_locked(session_id, lambda context: context.append_unique("resolved_errors", error))
 
     def set_user_intent(self, session_id: str, intent: str) -> None:
         """Set user intent"""
@@ -192,63 +476,176 @@ class ProtectedContextManager:
         self.update(session_id, active_skills=skills)
 
     def compute_claude_md_hash(self, cwd: str) -> str:
-        """Compute CLAUDE.md file hash"""
+        """Compute CLAUDE.md file hash (8 hex chars, change detection only)"""
         claude_md_path = Path(cwd) / "CLAUDE.md"
-        if claude_md_path.exists():
-            content = claude_md_path.read_text(encoding='utf-8')
-            return hashlib.sha256(content.encode()).hexdigest()[:8]
-        return ""
+        try:
+            st = claude_md_path.stat()
+        except FileNotFoundError:
+            self._md_hash_cache.pop(claude_md_path, None)
+            return ""
+
+        # Unchanged file (same mtime and size): reuse the previous hash
+        cached = self._md_hash_cache.get(claude_md_path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+
+        try:
+            content = claude_md_path.read_bytes()
+        except FileNotFoundError:
+            return ""
+        import hashlib
+
+        # Raw bytes (no decode/re-encode); 4-byte BLAKE2b digest = 8 hex chars
+        md_hash = hashlib.blake2b(content, digest_size=4).hexdigest()
+        self._md_hash_cache[claude_md_path] = (st.st_mtime_ns, st.st_size, md_hash)
+        return md_hash
 
     def delete(self, session_id: str) -> None:
         """Delete context"""
+        self._cache.pop(session_id, None)
+        self._cache_mtime_ns.pop(session_id, None)
+
         path = self._get_context_path(session_id)
-        lock_path = self._get_lock_path(session_id)
 
         if path.exists():
             path.unlink()
-        if lock_path.exists():
-            lock_path.unlink()
+        if self.use_file_lock:
+            lock_path = self._get_lock_path(session_id)
+            if lock_path.exists():
+                lock_path.unlink()
+
+        self._update_index({session_id: None})
 
     def list_sessions(self) -> List[str]:
         """List saved session IDs"""
-        sessions = []
-        for f in self.state_dir.glob("*_protected.json"):
-            session_id = f.stem.replace("_protected", "")
-            sessions.append(session_id)
-        return sessions
+        with os.scandir(self.state_dir) as it:
+            return [
+                entry.name[:-_CONTEXT_SUFFIX_LEN]
+                for entry in it
+                if entry.name.endswith(_CONTEXT_SUFFIX)
+            ]
+
+    def _index_row(self, meta: SessionMeta, mtime_ns: int) -> Dict[str, Any]:
+        """Session summary stored in the index"""
+        return {
+            "updated_at": meta.updated_at,
+            "working_directory": meta.working_directory,
+            "has_meaningful_content": meta.has_meaningful_content,
+            "mtime_ns": mtime_ns,
+        }
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            data = _json_loads(self._get_index_path().read_bytes())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _update_index(self, rows: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """Merge rows into the index (None removes a session)"""
+        with _file_lock_class()(str(self._get_index_lock_path())):
+            index = self._read_index()
+            for session_id, row in rows.items():
+                if row is None:
+                    index.pop(session_id, None)
+                else:
+                    index[session_id] = row
+            _atomic_write(self._get_index_path(), _json_dumps(index))
+
+    def get_index_row(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Index row for one session (rebuilt if its context file changed)"""
+        try:
+            mtime_ns = self._get_context_path(session_id).stat().st_mtime_ns
+        except OSError:
+            return None
+
+        row = self._read_index().get(session_id)
+        if isinstance(row, dict) and row.get("mtime_ns") == mtime_ns:
+            return row
+
+        meta = self.load_meta(session_id)
+        if meta is None:
+            return None
+        row = self._index_row(meta, mtime_ns)
+        self._update_index({session_id: row})
+        return row
+
+    def load_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load per-session summaries without parsing every context file
+
+        The index is maintained lazily: context writes don't touch it, so
+        rows whose context file changed since (mtime mismatch) or that are
+        missing are rebuilt here from the file; rows for deleted files are
+        dropped.
+        """
+        index = self._read_index()
+        current = {}
+        changes: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        for session_id, mtime_ns in self.list_session_timestamps():
+            row = index.get(session_id)
+            if not isinstance(row, dict) or row.get("mtime_ns") != mtime_ns:
+                meta = self.load_meta(session_id)
+                if meta is None:
+                    continue
+                row = self._index_row(meta, mtime_ns)
+                changes[session_id] = row
+            current[session_id] = row
+
+        for session_id in index:
+            if session_id not in current:
+                changes[session_id] = None
+
+        if changes:
+            self._update_index(changes)
+        return current
+
+    def list_session_timestamps(self) -> List[Tuple[str, int]]:
+        """List (session_id, last saved epoch ns) from file mtimes without parsing contexts"""
+        timestamps = []
+        with os.scandir(self.state_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(_CONTEXT_SUFFIX):
+                    continue
+                try:
+                    timestamps.append((entry.name[:-_CONTEXT_SUFFIX_LEN], entry.stat().st_mtime_ns))
+                except OSError:
+                    pass
+        return timestamps
+
+    # Static parts of the recovery message
+    RECOVERY_HEADER = "## 🔄 Context Recovered\n"
+    RECOVERY_FOOTER = "---\n⚠️ File contents need to be re-read."
+
+    @staticmethod
+    def _bullets(items: List[str], code: bool = False) -> str:
+        """Markdown bullet list (one C-level join instead of an f-string per item)"""
+        if code:
+            return "- `" + "`\n- `".join(items) + "`"
+        return "- " + "\n- ".join(items)
 
     def build_recovery_message(self, context: ProtectedContext) -> str:
         """Build recovery message"""
-        parts = ["## 🔄 Context Recovered\n"]
+        bullets = self._bullets
+        parts = [self.RECOVERY_HEADER]
 
         if context.user_intent:
             parts.append(f"### Task Purpose\n{context.user_intent}\n")
-
         if context.working_directory:
             parts.append(f"### Working Directory\n`{context.working_directory}`\n")
-
         if context.active_skills:
-            skills_list = "\n".join(f"- `{s}`" for s in context.active_skills)
-            parts.append(f"### Active Skills\n{skills_list}\n")
-
+            parts.append(f"### Active Skills\n{bullets(context.active_skills, code=True)}\n")
         if context.key_decisions:
-            decisions_list = "\n".join(f"- {d}" for d in context.key_decisions[-5:])
-            parts.append(f"### Key Decisions (last 5)\n{decisions_list}\n")
-
+            parts.append(f"### Key Decisions (last 5)\n{bullets(context.key_decisions[-5:])}\n")
         if context.resolved_errors:
-            errors_list = "\n".join(f"- {e}" for e in context.resolved_errors[-3:])
-            parts.append(f"### Resolved Errors (last 3)\n{errors_list}\n")
-
+            parts.append(f"### Resolved Errors (last 3)\n{bullets(context.resolved_errors[-3:])}\n")
         if context.pending_tasks:
-            tasks_list = "\n".join(f"- {t}" for t in context.pending_tasks)
-            parts.append(f"### Next Tasks\n{tasks_list}\n")
-
+            parts.append(f"### Next Tasks\n{bullets(context.pending_tasks)}\n")
         if context.active_files:
-            files_list = "\n".join(f"- `{f}`" for f in context.active_files[-10:])
-            parts.append(f"### Active Files (last 10)\n{files_list}\n")
-
-        parts.append("---\n⚠️ File contents need to be re-read.")
+            parts.append(f"### Active Files (last 10)\n{bullets(context.active_files[-10:], code=True)}\n")
 
+        parts.append(self.RECOVERY_FOOTER)
         return "\n".join(parts)
 
 
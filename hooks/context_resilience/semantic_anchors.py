@@ -8,21 +8,42 @@ Anchor types:
 - FILE_MODIFIED: File modification completed
 - USER_EXPLICIT: User explicit marking ("remember", "important:")
 - CHECKPOINT: Manual checkpoint
+
+Storage location: ~/.claude/hooks/state/{session_id}_anchors.jsonl
+(append-only log: one anchor per line, plus {"evicted": id} lines for
+anchors dropped by the per-session limit; compacted when it grows)
 """
 
+import atexit
 import json
+import os
 import re
 import sys
 import hashlib
+import heapq
+from collections import OrderedDict
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set, Tuple, Union
 from filelock import FileLock
 
 from .config import get_config, ContextResilienceConfig
 
+# orjson is optional (faster encode/decode of anchor log lines)
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    _ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    def _json_dumps(data) -> bytes:
+        return _ENCODER.encode(data).encode('utf-8')
+
 
 class AnchorType(Enum):
     """Anchor type"""
@@ -49,6 +70,37 @@ ANCHOR_PATTERNS: Dict[AnchorType, List[str]] = {
     ],
 }
 
+# Literal prescreen: every ANCHOR_PATTERNS match contains at least one of
+# these (lowercase) substrings, so text containing none of them cannot match
+# (keep in sync with ANCHOR_PATTERNS)
+ANCHOR_KEYWORDS = (
+    "decided", "choose", "let's go with", "we'll use", "going with",
+    "approach", "decision", "selected", "determined",
+    "fixed", "resolved", "working now", "solved",
+    "remember", "important:", "note:", "key point:", "never forget",
+)
+
+# Compiled once at import: one alternation per type for detection, and one
+# extraction regex per pattern ("content after the pattern", tried in order)
+ANCHOR_RE: Dict[AnchorType, re.Pattern] = {
+    anchor_type: re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+    for anchor_type, patterns in ANCHOR_PATTERNS.items()
+}
+ANCHOR_EXTRACT_RE: Dict[AnchorType, List[re.Pattern]] = {
+    anchor_type: [re.compile(f"(?:{p})[:\\s]*(.+)", re.IGNORECASE) for p in patterns]
+    for anchor_type, patterns in ANCHOR_PATTERNS.items()
+}
+# Every type in one scan (named group per type); text with no anchor, the
+# common case, costs a single search
+ALL_ANCHORS_RE = re.compile(
+    "|".join(
+        f"(?P<{anchor_type.value}>{'|'.join(patterns)})"
+        for anchor_type, patterns in ANCHOR_PATTERNS.items()
+    ),
+    re.IGNORECASE,
+)
+_EMPHASIS_RE = re.compile(r'critical|important|key|must', re.IGNORECASE)
+
 
 @dataclass
 class SemanticAnchor:
@@ -69,59 +121,234 @@ class SemanticAnchor:
             self.content = self.content[:197] + "..."
 
 
+# Anchor file format
+ANCHORS_SUFFIX = "_anchors.jsonl"
+LEGACY_ANCHORS_SUFFIX = "_anchors.json"  # Older whole-file JSON array
+
+
+def parse_anchor_log(raw: bytes) -> List[Dict[str, Any]]:
+    """Live anchor records of an anchor log, in order"""
+    live: Dict[str, Dict[str, Any]] = {}
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            item = _json_loads(line)
+        except ValueError:
+            continue  # Torn trailing line from an interrupted append
+        if "evicted" in item:
+            live.pop(item["evicted"], None)
+        else:
+            live[item.get("id", "")] = item
+    return list(live.values())
+
+
+def encode_anchor_log(records: List[Dict[str, Any]]) -> bytes:
+    """Compacted anchor log: one record per line"""
+    return b"".join(_json_dumps(record) + b"\n" for record in records)
+
+
+def write_anchor_log(path: Union[str, Path], records: List[Dict[str, Any]]) -> None:
+    """Write a compacted anchor log via a temp file + os.replace (a crash
+    mid-write leaves the previous log intact, never a truncated one)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(encode_anchor_log(records))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_anchor_file(path: str) -> List[Dict[str, Any]]:
+    """Anchor records of a log file (or of a legacy JSON array file)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if path.endswith(LEGACY_ANCHORS_SUFFIX):
+        return _json_loads(raw)
+    return parse_anchor_log(raw)
+
+
 class SemanticAnchorManager:
     """Semantic anchor manager"""
 
     STATE_DIR = Path("~/.claude/hooks/state").expanduser()
     MAX_ANCHORS = 50  # Max anchors per session
+    CACHE_CAP = 32  # Sessions whose anchor lists are kept in memory
+    COMPACT_FACTOR = 2  # Rewrite the log once it holds this many x max anchors lines
 
     def __init__(self, config: Optional[ContextResilienceConfig] = None):
         self.config = config or get_config()
         self.STATE_DIR.mkdir(parents=True, exist_ok=True)
 
+        # Parsed anchor lists (LRU): each file is read once, saves write
+        # through. _dirty holds sessions whose write failed, retried by
+        # flush() (on eviction, and at exit for the singleton).
+        self._cache: "OrderedDict[str, List[SemanticAnchor]]" = OrderedDict()
+        self._dirty: Set[str] = set()
+        # Line count of each cached session's log (None = no log yet)
+        self._log_lines: Dict[str, Optional[int]] = {}
+        # (st_mtime_ns, st_size) of each cached session's log as last read or
+        # written here (None = no log); a mismatch means another process
+        # changed it and the cached list is reloaded
+        self._log_stat: Dict[str, Optional[Tuple[int, int]]] = {}
+
     def _get_anchors_path(self, session_id: str) -> Path:
-        """Anchor file path"""
-        return self.STATE_DIR / f"{session_id}_anchors.json"
+        """Anchor log path"""
+        return self.STATE_DIR / f"{session_id}{ANCHORS_SUFFIX}"
+
+    def _get_legacy_anchors_path(self, session_id: str) -> Path:
+        """Pre-log anchor file path (read once, replaced on the next write)"""
+        return self.STATE_DIR / f"{session_id}{LEGACY_ANCHORS_SUFFIX}"
 
     def _get_lock_path(self, session_id: str) -> Path:
         """Lock file path"""
         return self.STATE_DIR / f"{session_id}_anchors.lock"
 
+    @staticmethod
+    def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+        """(st_mtime_ns, st_size) of a file, None if it does not exist"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
     def _generate_anchor_id(self, content: str, timestamp: str) -> str:
         """Generate anchor ID"""
         data = f"{content}{timestamp}"
-        return hashlib.sha256(data.encode()).hexdigest()[:12]
+        return hashlib.blake2b(data.encode(), digest_size=6).hexdigest()
+
+    def _cache_put(self, session_id: str, anchors: List[SemanticAnchor]) -> None:
+        """Store a session's anchor list as most recently used (evicting the oldest)"""
+        self._cache[session_id] = anchors
+        self._cache.move_to_end(session_id)
+        while len(self._cache) > self.CACHE_CAP:
+            evicted_id, evicted = self._cache.popitem(last=False)
+            if evicted_id in self._dirty:
+                self._write_anchors(evicted_id, evicted)
+            self._log_lines.pop(evicted_id, None)
+            self._log_stat.pop(evicted_id, None)
 
     def load_anchors(self, session_id: str) -> List[SemanticAnchor]:
-        """Load anchor list"""
+        """Load anchor list (a copy: callers may reorder or filter it)"""
         path = self._get_anchors_path(session_id)
-        if not path.exists():
+        cached = self._cache.get(session_id)
+        # A failed write leaves the cached list authoritative; otherwise it
+        # is valid while the log is unchanged on disk (one stat, no lock)
+        if cached is not None and (
+            session_id in self._dirty
+            or self._stat_key(path) == self._log_stat.get(session_id)
+        ):
+            self._cache.move_to_end(session_id)
+            return list(cached)
+
+        legacy_path = self._get_legacy_anchors_path(session_id)
+        if not path.exists() and not legacy_path.exists():
+            self._cache_put(session_id, [])
+            self._log_lines[session_id] = None
+            self._log_stat[session_id] = None
             return []
 
         lock = FileLock(self._get_lock_path(session_id))
         try:
             with lock.acquire(timeout=5):
-                data = json.loads(path.read_text(encoding='utf-8'))
-                return [SemanticAnchor(**item) for item in data]
+                log_stat = self._stat_key(path)
+                if log_stat is not None:
+                    raw = path.read_bytes()
+                    data = parse_anchor_log(raw)
+                    log_lines = raw.count(b"\n")
+                else:
+                    data = _json_loads(legacy_path.read_bytes())
+                    log_lines = None
+                anchors = [SemanticAnchor(**item) for item in data]
         except Exception as e:
             print(f"[semantic_anchors] Failed to load anchors for {session_id}: {e}", file=sys.stderr)
             return []
 
+        self._cache_put(session_id, anchors)
+        self._log_lines[session_id] = log_lines
+        self._log_stat[session_id] = log_stat
+        return list(anchors)
+
     def save_anchors(self, session_id: str, anchors: List[SemanticAnchor]) -> None:
-        """Save anchor list"""
+        """Save anchor list (cache updated, file written through)"""
+        anchors = list(anchors)
+        self._cache_put(session_id, anchors)
+        self._write_anchors(session_id, anchors)
+
+    def _write_anchors(self, session_id: str, anchors: List[SemanticAnchor]) -> None:
+        """Rewrite (compact) an anchor log (marked dirty if the write fails)"""
         path = self._get_anchors_path(session_id)
         lock = FileLock(self._get_lock_path(session_id))
 
         try:
             with lock.acquire(timeout=5):
-                data = [asdict(a) for a in anchors]
-                path.write_text(
-                    json.dumps(data, indent=2, ensure_ascii=False),
-                    encoding='utf-8'
-                )
+                write_anchor_log(path, [asdict(a) for a in anchors])
+                # The log supersedes a legacy JSON array file
+                self._get_legacy_anchors_path(session_id).unlink(missing_ok=True)
+                self._log_stat[session_id] = self._stat_key(path)
+            self._dirty.discard(session_id)
+            self._log_lines[session_id] = len(anchors)
+        except Exception as e:
+            self._dirty.add(session_id)
+            print(f"[semantic_anchors] Failed to save anchors for {session_id}: {e}", file=sys.stderr)
+
+    def _append_anchor(
+        self,
+        session_id: str,
+        anchor: SemanticAnchor,
+        evicted_id: Optional[str],
+        anchors: List[SemanticAnchor],
+        max_anchors: int
+    ) -> None:
+        """Append one anchor (and the eviction it caused) to the log"""
+        log_lines = self._log_lines.get(session_id)
+        new_lines = 2 if evicted_id else 1
+        if (
+            log_lines is None
+            or session_id in self._dirty
+            or log_lines + new_lines > max_anchors * self.COMPACT_FACTOR
+        ):
+            # No log yet, an earlier write failed, or the log grew too long
+            self._write_anchors(session_id, anchors)
+            return
+
+        data = _json_dumps(asdict(anchor)) + b"\n"
+        if evicted_id:
+            data = _json_dumps({"evicted": evicted_id}) + b"\n" + data
+
+        path = self._get_anchors_path(session_id)
+        lock = FileLock(self._get_lock_path(session_id))
+        try:
+            with lock.acquire(timeout=5):
+                with open(path, 'ab+') as f:
+                    # Start on a fresh line after a torn (interrupted) append
+                    end = f.seek(0, os.SEEK_END)
+                    if end:
+                        f.seek(end - 1)
+                        if f.read(1) != b"\n":
+                            data = b"\n" + data
+                    f.write(data)
+                self._log_stat[session_id] = self._stat_key(path)
+            self._log_lines[session_id] = log_lines + new_lines
         except Exception as e:
+            self._dirty.add(session_id)
             print(f"[semantic_anchors] Failed to save anchors for {session_id}: {e}", file=sys.stderr)
 
+    def flush(self) -> None:
+        """Retry writes that failed for cached sessions"""
+        for session_id in list(self._dirty):
+            anchors = self._cache.get(session_id)
+            if anchors is None:
+                self._dirty.discard(session_id)
+            else:
+                self._write_anchors(session_id, anchors)
+
     def add_anchor(
         self,
         session_id: str,
@@ -135,10 +362,12 @@ class SemanticAnchorManager:
 
         # Max count limit (LRU)
         max_anchors = self.config.max_anchors or self.MAX_ANCHORS
+        evicted_id = None
         if len(anchors) >= max_anchors:
-            # Delete from lowest importance (low importance and oldest)
-            anchors.sort(key=lambda a: (a.importance, a.timestamp))
-            anchors = anchors[1:]  # Delete lowest one
+            # Delete from lowest importance (low importance and oldest);
+            # the rest keep their order, matching the log
+            lowest = min(range(len(anchors)), key=lambda i: (anchors[i].importance, anchors[i].timestamp))
+            evicted_id = anchors.pop(lowest).id
 
         timestamp = datetime.now().isoformat()
         anchor = SemanticAnchor(
@@ -152,7 +381,8 @@ class SemanticAnchorManager:
         )
 
         anchors.append(anchor)
-        self.save_anchors(session_id, anchors)
+        self._cache_put(session_id, anchors)
+        self._append_anchor(session_id, anchor, evicted_id, anchors, max_anchors)
 
         return anchor
 
@@ -166,9 +396,10 @@ class SemanticAnchorManager:
         if not self.config.enabled:
             return None
 
-        detected_type = self.detect_anchor_type(text)
-        if not detected_type:
+        detected = self._detect(text)
+        if not detected:
             return None
+        detected_type, start = detected
 
         # Check anchor type config
         anchor_config = self.config.anchor_detection
@@ -183,7 +414,7 @@ class SemanticAnchorManager:
         importance = self._calculate_importance(detected_type, text)
 
         # Extract key content
-        content = self._extract_key_content(text, detected_type)
+        content = self._extract_key_content(text, detected_type, start)
 
         return self.add_anchor(
             session_id=session_id,
@@ -195,11 +426,32 @@ class SemanticAnchorManager:
 
     def detect_anchor_type(self, text: str) -> Optional[AnchorType]:
         """Detect anchor type from text"""
-        for anchor_type, patterns in ANCHOR_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    return anchor_type
-        return None
+        detected = self._detect(text)
+        return detected[0] if detected else None
+
+    def _detect(self, text: str) -> Optional[Tuple[AnchorType, int]]:
+        """Detect anchor type and the offset where the first pattern matched"""
+        # Substring checks are far cheaper than the regex scan. Only ASCII
+        # text is prescreened: str.lower() and IGNORECASE fold a few
+        # non-ASCII letters differently (e.g. U+0130, U+017F)
+        if text.isascii():
+            lowered = text.lower()
+            if not any(keyword in lowered for keyword in ANCHOR_KEYWORDS):
+                return None
+
+        match = ALL_ANCHORS_RE.search(text)
+        if match is None:
+            return None
+
+        # Types have priority in ANCHOR_PATTERNS order, not by position: an
+        # earlier-listed type can still match further into the text (never
+        # before match.start(), or the combined scan would have found it)
+        start = match.start()
+        found = AnchorType(match.lastgroup)
+        for anchor_type, pattern_re in ANCHOR_RE.items():
+            if anchor_type is found or pattern_re.search(text, start):
+                return anchor_type, start
+        return found, start
 
     def _calculate_importance(self, anchor_type: AnchorType, text: str) -> int:
         """Calculate anchor importance (1-5)"""
@@ -214,26 +466,27 @@ class SemanticAnchorManager:
         importance = base_importance.get(anchor_type, 2)
 
         # +1 if emphasis expression present
-        if re.search(r'critical|important|key|must', text, re.IGNORECASE):
+        if _EMPHASIS_RE.search(text):
             importance = min(5, importance + 1)
 
         return importance
 
-    def _extract_key_content(self, text: str, anchor_type: AnchorType) -> str:
-        """Extract key content"""
-        # First sentence or first 100 chars
-        lines = text.strip().split('\n')
-        first_line = lines[0] if lines else text
+    def _extract_key_content(self, text: str, anchor_type: AnchorType, start: int = 0) -> str:
+        """Extract key content
 
+        start is where detection found the first pattern match; no pattern
+        matches before it, so the extraction scan can begin there.
+        """
         # Try to extract content after pattern
-        for pattern in ANCHOR_PATTERNS.get(anchor_type, []):
-            match = re.search(f'{pattern}[:\\s]*(.+)', text, re.IGNORECASE)
+        for extract_re in ANCHOR_EXTRACT_RE.get(anchor_type, ()):
+            match = extract_re.search(text, start)
             if match:
                 content = match.group(1).strip()
                 if content:
                     return content[:200]
 
-        return first_line[:200]
+        # First line, up to 200 chars
+        return text.strip().partition('\n')[0][:200]
 
     def get_recent_anchors(
         self,
@@ -246,13 +499,11 @@ class SemanticAnchorManager:
 
         # Type filter
         if anchor_types:
-            type_values = [t.value for t in anchor_types]
+            type_values = {t.value for t in anchor_types}
             anchors = [a for a in anchors if a.anchor_type in type_values]
 
-        # Sort by newest + importance
-        anchors.sort(key=lambda a: (a.importance, a.timestamp), reverse=True)
-
-        return anchors[:limit]
+        # Top by importance + newest, without sorting the whole list
+        return heapq.nlargest(limit, anchors, key=lambda a: (a.importance, a.timestamp))
 
     def add_file_modified_anchor(
         self,
@@ -318,9 +569,10 @@ class SemanticAnchorManager:
     def list_sessions(self) -> List[str]:
         """List sessions with anchors"""
         sessions = set()
-        for f in self.STATE_DIR.glob("*_anchors.json"):
-            session_id = f.stem.replace("_anchors", "")
-            sessions.add(session_id)
+        for f in self.STATE_DIR.iterdir():
+            for suffix in (ANCHORS_SUFFIX, LEGACY_ANCHORS_SUFFIX):
+                if f.name.endswith(suffix):
+                    sessions.add(f.name[:-len(suffix)])
         return list(sessions)
 
     def cleanup_old_anchors(self, max_age_days: int = 7) -> int:
@@ -330,11 +582,21 @@ class SemanticAnchorManager:
         cutoff = datetime.now() - timedelta(days=max_age_days)
         deleted = 0
 
-        for f in self.STATE_DIR.glob("*_anchors.json"):
+        for f in self.STATE_DIR.iterdir():
+            if f.name.endswith(ANCHORS_SUFFIX):
+                session_id = f.name[:-len(ANCHORS_SUFFIX)]
+            elif f.name.endswith(LEGACY_ANCHORS_SUFFIX):
+                session_id = f.name[:-len(LEGACY_ANCHORS_SUFFIX)]
+            else:
+                continue
             try:
                 mtime = datetime.fromtimestamp(f.stat().st_mtime)
                 if mtime < cutoff:
                     f.unlink()
+                    self._cache.pop(session_id, None)
+                    self._dirty.discard(session_id)
+                    self._log_lines.pop(session_id, None)
+                    self._log_stat.pop(session_id, None)
                     # Delete lock file too
                     lock_file = f.with_suffix('.lock')
                     if lock_file.exists():
@@ -355,4 +617,5 @@ def get_semantic_anchor_manager() -> SemanticAnchorManager:
     global _anchor_manager
     if _anchor_manager is None:
         _anchor_manager = SemanticAnchorManager()
+        atexit.register(_anchor_manager.flush)
     return _anchor_manager
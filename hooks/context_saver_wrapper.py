@@ -29,8 +29,13 @@ from typing import Dict, Any, Optional, List
 HOOKS_DIR = Path(__file__).parent
 LOG_FILE = HOOKS_DIR / "logs" / "context-saver.log"
 
-# Lazy import flag
-_resilience_imported = False
+# context_resilience is imported inside the process_* functions (lazily)
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+# Keyword patterns for completed todos (compiled once, used per task)
+_DECISION_RE = re.compile(r"decided|choose|let's go with|approach", re.IGNORECASE)
+_ERROR_RESOLVED_RE = re.compile(r"fixed|resolved|working now|bug.*fixed", re.IGNORECASE)
 
 
 def log(message: str):
@@ -55,29 +60,16 @@ def extract_todos(tool_input: Dict[str, Any]) -> list:
 
 def detect_decision_keywords(text: str) -> bool:
     """Detect decision-related keywords"""
-    patterns = [
-        r'decided|choose|let\'s go with|approach'
-    ]
-    for pattern in patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    return False
+    return _DECISION_RE.search(text) is not None
 
 
 def detect_error_resolved(text: str) -> bool:
     """Detect error resolved keywords"""
-    patterns = [
-        r'fixed|resolved|working now|bug.*fixed'
-    ]
-    for pattern in patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    return False
+    return _ERROR_RESOLVED_RE.search(text) is not None
 
 
 def process_edit_write(session_id: str, tool_name: str, tool_input: Dict[str, Any], cwd: str):
     """Process Edit/Write tool"""
-    sys.path.insert(0, str(HOOKS_DIR))
     from context_resilience import (
         get_protected_context_manager,
         get_config,
@@ -115,7 +107,6 @@ def process_edit_write(session_id: str, tool_name: str, tool_input: Dict[str, An
 
 def process_todo_write(session_id: str, tool_input: Dict[str, Any], cwd: str):
     """Process TodoWrite tool"""
-    sys.path.insert(0, str(HOOKS_DIR))
     from context_resilience import (
         get_protected_context_manager,
         get_config,
@@ -9,6 +9,7 @@ How it works:
 4. Reach consensus or weighted voting
 """
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
@@ -131,7 +132,7 @@ Review other reviewers' opinions and make your final judgment.
         current_results = initial_results.copy()
 
         for round_num in range(2, self.max_rounds + 2):  # Start from round 2
-            new_results = []
+            jobs = []
 
             for adapter in adapters:
                 # Show results from other adapters
@@ -143,9 +144,17 @@ Review other reviewers' opinions and make your final judgment.
                 debate_prompt = self.build_debate_prompt(
                     original_prompt, other_results, round_num
                 )
+                jobs.append((adapter, debate_prompt))
 
-                result = adapter.review(debate_prompt, context)
-                new_results.append(result)
+            # Adapters in a round are independent: run them concurrently
+            new_results = []
+            if jobs:
+                with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                    futures = [
+                        executor.submit(adapter.review, debate_prompt, context)
+                        for adapter, debate_prompt in jobs
+                    ]
+                    new_results = [future.result() for future in futures]
 
             if not new_results:
                 break
@@ -3,6 +3,7 @@ Intent Extraction Module - Extract original user request from transcript
 Includes summarization considering token limits
 """
 import json
+import itertools
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
@@ -12,13 +13,14 @@ class IntentExtractor:
 
     MAX_CHARS = 10000  # Token limit (approx 2500 tokens)
     SEPARATOR = "\n\n---\n\n"  # Message separator (used for both combining and truncation check)
+    USER_ROLES = ("user", "human")
 
     def extract_from_transcript(self, transcript_path: str) -> Dict[str, Any]:
         """
         Extract user intent from transcript file
 
         Args:
-            transcript_path: transcript JSON file path
+            transcript_path: transcript JSON or JSONL file path
 
         Returns:
             Dict containing:
@@ -53,15 +55,39 @@ class IntentExtractor:
             }
 
     def _load_transcript(self, transcript_path: str) -> List[Dict[str, Any]]:
-        """Load transcript file"""
+        """Load transcript file (JSON document or JSONL stream)"""
         path = Path(transcript_path)
         if not path.exists():
             return []
 
-        content = path.read_text(encoding="utf-8")
-        data = json.loads(content)
-
-        # Handle based on transcript structure
+        with open(path, "rb") as f:
+            first_line = f.readline()
+            try:
+                first = json.loads(first_line)
+            except ValueError:
+                # Multi-line JSON document
+                f.seek(0)
+                return self._unwrap_document(json.load(f))
+
+            if not isinstance(first, dict) or "messages" in first:
+                return self._unwrap_document(first)
+
+            # JSONL: stream line by line, keeping only user entries
+            messages = []
+            for line in itertools.chain((first_line,), f):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Blank or partially written line
+                if not isinstance(entry, dict):
+                    continue
+                msg = entry.get("message", entry)
+                if isinstance(msg, dict) and msg.get("role") in self.USER_ROLES:
+                    messages.append(msg)
+            return messages
+
+    def _unwrap_document(self, data: Any) -> List[Dict[str, Any]]:
+        """Handle based on transcript structure"""
         if isinstance(data, list):
             return data
         elif isinstance(data, dict) and "messages" in data:
@@ -72,8 +98,7 @@ class IntentExtractor:
         """Extract user messages only"""
         messages = []
         for msg in transcript:
-            role = msg.get("role", "")
-            if role == "user" or role == "human":
+            if msg.get("role", "") in self.USER_ROLES:
                 content = msg.get("content", "")
                 # Handle list content (multimodal)
                 if isinstance(content, list):
@@ -27,6 +27,7 @@ class AdapterQuota:
     last_failure: Optional[str] = None
     failure_count: int = 0
     success_count: int = 0
+    skipped_count: int = 0
     consecutive_failures: int = 0
     cooldown_until: Optional[str] = None
 
@@ -77,6 +78,7 @@ class QuotaMonitor:
                         last_failure=q.get("last_failure"),
                         failure_count=q.get("failure_count", 0),
                         success_count=q.get("success_count", 0),
+                        skipped_count=q.get("skipped_count", 0),
                         consecutive_failures=q.get("consecutive_failures", 0),
                         cooldown_until=q.get("cooldown_until")
                     )
@@ -139,6 +141,17 @@ class QuotaMonitor:
 
         self._save_state()
 
+    def record_skipped(self, adapter_name: str) -> None:
+        """Record a call abandoned before its result was used (status unchanged)"""
+        if adapter_name not in self.quotas:
+            self.quotas[adapter_name] = AdapterQuota(
+                adapter_name=adapter_name,
+                status=QuotaStatus.UNKNOWN
+            )
+
+        self.quotas[adapter_name].skipped_count += 1
+        self._save_state()
+
     def is_available(self, adapter_name: str) -> bool:
         """Check adapter availability"""
         if adapter_name not in self.quotas:
@@ -177,7 +190,8 @@ class QuotaMonitor:
                 name: {
                     "status": q.status.value,
                     "success": q.success_count,
-                    "failures": q.failure_count
+                    "failures": q.failure_count,
+                    "skipped": q.skipped_count
                 }
                 for name, q in self.quotas.items()
             }
@@ -7,10 +7,12 @@ Run:
 
 Test items:
 1. Protected Context save/load/recovery message
-2. Semantic Anchors detection/save/query
+2. Semantic Anchors detection/save/query, anchor log format
 3. Auto Recovery session finding/recovery
-4. Cleanup statistics/cleaning
+4. Cleanup statistics/cleaning (on a temporary state/memory tree)
 5. Hook Wrapper simulation
+6. Completion audit logger writer thread
+7. Adapter response parsing
 """
 
 import json
@@ -81,6 +83,65 @@ def test_protected_context():
     sessions = pcm.list_sessions()
     test("list_sessions", session_id in sessions)
 
+    # 8. Session timestamps
+    timestamps = dict(pcm.list_session_timestamps())
+    test("list_session_timestamps", timestamps.get(session_id, 0) > 0)
+
+    # 9. Session index
+    index = pcm.load_index()
+    row = index.get(session_id, {})
+    test("load_index", row.get("working_directory") == "/test/project"
+         and row.get("has_meaningful_content") is True)
+    test("get_index_row", pcm.get_index_row(session_id) == row)
+
+    # 10. Partial meta load
+    meta = pcm.load_meta(session_id)
+    test("load_meta", meta is not None and meta.working_directory == "/test/project"
+         and meta.has_meaningful_content)
+
+    # 11. Updates are written through by default
+    from context_resilience import ProtectedContextManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = ProtectedContextManager(tmp)
+        writer.add_decision("s", "written")
+        ctx = ProtectedContextManager(tmp).load("s")
+        test("update written through", ctx is not None and ctx.key_decisions == ["written"])
+
+        # 12. update() returns a copy; changing it leaves the stored context alone
+        returned = writer.update("s", user_intent="kept")
+        returned.key_decisions.append("not saved")
+        returned.user_intent = "changed"
+        writer.add_decision("s", "second")
+        ctx = ProtectedContextManager(tmp).load("s")
+        test("update returns a copy",
+             ctx.key_decisions == ["written", "second"] and ctx.user_intent == "kept",
+             f"got {ctx.key_decisions}, {ctx.user_intent!r}")
+
+        # 13. Writes leave the index alone; load_index rebuilds the stale row
+        writer.load_index()
+        writer.set_working_directory("s", "/moved")
+        row = writer.get_index_row("s")
+        test("index row rebuilt lazily", row is not None and row["working_directory"] == "/moved"
+             and writer.load_index()["s"] == row)
+
+        # 14. Concurrent hook processes don't lose each other's updates
+        import subprocess
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1])\n"
+            "from context_resilience import ProtectedContextManager\n"
+            "manager = ProtectedContextManager(sys.argv[2])\n"
+            "for i in range(20):\n"
+            "    manager.update('race', user_intent=str(i))\n"
+        )
+        hooks_dir = str(Path(__file__).resolve().parent)
+        procs = [subprocess.Popen([sys.executable, "-c", script, hooks_dir, tmp]) for _ in range(4)]
+        for proc in procs:
+            proc.wait()
+        ctx = ProtectedContextManager(tmp).load("race")
+        test("concurrent process updates serialized", ctx is not None and ctx.version == 81,
+             f"version {ctx.version if ctx else None}")
+
     return session_id
 
 
@@ -133,6 +194,78 @@ def test_semantic_anchors(session_id):
     test("build_anchors_summary", len(summary) > 0)
 
 
+def test_anchor_log():
+    """Anchor JSONL log format tests"""
+    print("\n=== Anchor Log ===")
+
+    from context_resilience import ContextResilienceConfig, SemanticAnchorManager, AnchorType
+    from context_resilience.semantic_anchors import parse_anchor_log
+
+    def manager(state_dir, max_anchors=50):
+        sam = SemanticAnchorManager(ContextResilienceConfig(max_anchors=max_anchors))
+        sam.STATE_DIR = state_dir
+        return sam
+
+    # 1. Tombstones drop records, a torn trailing line is skipped
+    raw = (b'{"id": "a", "content": "A"}\n{"id": "b", "content": "B"}\n'
+           b'{"evicted": "a"}\n{"id": "c", "con')
+    records = parse_anchor_log(raw)
+    test("parse_anchor_log", [r["id"] for r in records] == ["b"], f"got {records}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_dir = Path(tmp)
+
+        # 2. Round trip through the log
+        writer = manager(state_dir)
+        added = [writer.add_anchor("s", AnchorType.DECISION, f"decision {i}") for i in range(3)]
+        loaded = manager(state_dir).load_anchors("s")
+        test("anchor log round trip", [a.id for a in loaded] == [a.id for a in added]
+             and loaded[0].content == "decision 0")
+
+        # 3. Eviction appends tombstones; another reader sees the same survivors
+        writer = manager(state_dir, max_anchors=3)
+        writer.add_anchor("e", AnchorType.DECISION, "low", importance=1)
+        writer.add_anchor("e", AnchorType.DECISION, "high", importance=5)
+        writer.add_anchor("e", AnchorType.DECISION, "mid", importance=3)
+        writer.add_anchor("e", AnchorType.DECISION, "new", importance=2)
+        log_text = (state_dir / "e_anchors.jsonl").read_text(encoding="utf-8")
+        loaded = manager(state_dir, max_anchors=3).load_anchors("e")
+        test("eviction tombstone appended", '"evicted"' in log_text)
+        test("eviction drops lowest importance",
+             [a.content for a in loaded] == ["high", "mid", "new"], f"got {[a.content for a in loaded]}")
+
+        # 4. The log is compacted once it outgrows COMPACT_FACTOR x max lines
+        for i in range(10):
+            writer.add_anchor("e", AnchorType.DECISION, f"more {i}", importance=4)
+        lines = (state_dir / "e_anchors.jsonl").read_bytes().count(b"\n")
+        test("anchor log compacted", lines <= 3 * writer.COMPACT_FACTOR, f"{lines} lines")
+        test("compaction leaves no temp file", not list(state_dir.glob("*.tmp")))
+        loaded = manager(state_dir, max_anchors=3).load_anchors("e")
+        test("compacted log keeps survivors",
+             [a.content for a in loaded] == [a.content for a in writer.load_anchors("e")])
+
+        # 5. A legacy JSON array file is read, then replaced by the log
+        legacy = [{"id": "old1", "session_id": "l", "anchor_type": "decision",
+                   "content": "legacy anchor", "timestamp": "2024-01-01T00:00:00", "importance": 3}]
+        (state_dir / "l_anchors.json").write_text(json.dumps(legacy), encoding="utf-8")
+        sam = manager(state_dir)
+        test("legacy anchors read", [a.id for a in sam.load_anchors("l")] == ["old1"])
+        sam.add_anchor("l", AnchorType.DECISION, "after migration")
+        loaded = manager(state_dir).load_anchors("l")
+        test("legacy file migrated to log",
+             not (state_dir / "l_anchors.json").exists() and [a.id for a in loaded][0] == "old1"
+             and len(loaded) == 2)
+
+        # 6. An append after a torn line starts on a fresh line
+        with open(state_dir / "s_anchors.jsonl", "ab") as f:
+            f.write(b'{"id": "torn", "sess')
+        reader = manager(state_dir)
+        test("torn line skipped", len(reader.load_anchors("s")) == 3)
+        reader.add_anchor("s", AnchorType.DECISION, "after torn line")
+        loaded = manager(state_dir).load_anchors("s")
+        test("append after torn line", len(loaded) == 4 and loaded[-1].content == "after torn line")
+
+
 def test_auto_recovery(session_id):
     """Auto Recovery tests"""
     print("\n=== Auto Recovery ===")
@@ -187,6 +320,105 @@ def test_cleanup():
     # Note: Actual cleanup not run in test
 
 
+def test_cleanup_operations():
+    """Cleanup tests on a temporary state/memory tree"""
+    print("\n=== Cleanup Operations ===")
+
+    import os
+    import time
+    from context_resilience import CleanupConfig, DataCleanup
+
+    def write(path, data, age_days=0):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data if isinstance(data, bytes) else json.dumps(data).encode("utf-8"))
+        if age_days:
+            old = time.time() - age_days * 86400
+            os.utime(path, (old, old))
+        return path
+
+    def anchor_line(i, importance):
+        return json.dumps({"id": f"a{i}", "session_id": "big", "anchor_type": "decision",
+                           "content": f"anchor {i}", "timestamp": f"2024-01-01T00:00:{i:02d}",
+                           "importance": importance}).encode("utf-8") + b"\n"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        class TempCleanup(DataCleanup):
+            STATE_DIR = root / "state"
+            MEMORY_DIR = root / "memory"
+            LAST_CLEANUP_FILE = root / "state" / ".last_cleanup"
+
+        state = TempCleanup.STATE_DIR
+        memory = TempCleanup.MEMORY_DIR
+        dc = TempCleanup(CleanupConfig(session_retention_days=14, max_anchors_per_session=50,
+                                       max_memory_size_mb=1))
+
+        # 1. Expired sessions go with their anchors and lock files
+        write(state / "old_protected.json", {"session_id": "old"}, age_days=30)
+        write(state / "old_anchors.jsonl", anchor_line(0, 1))
+        write(state / "old_anchors.lock", b"")
+        write(state / "new_protected.json", {"session_id": "new"})
+        deleted, freed = dc.cleanup_sessions()
+        test("cleanup_sessions deletes expired", deleted == 1 and freed > 0, f"got {deleted}, {freed}")
+        test("cleanup_sessions removes related files",
+             sorted(p.name for p in state.iterdir()) == ["new_protected.json"],
+             f"got {sorted(p.name for p in state.iterdir())}")
+
+        # 2. Expired orphan anchor files (log and legacy) with their lock
+        write(state / "gone_anchors.jsonl", anchor_line(0, 1), age_days=30)
+        write(state / "gone_anchors.lock", b"")
+        write(state / "legacy_anchors.json", [], age_days=30)
+        write(state / "live_anchors.jsonl", anchor_line(0, 1))
+        deleted, _ = dc.cleanup_anchors()
+        test("cleanup_anchors deletes expired", deleted == 2, f"got {deleted}")
+        test("cleanup_anchors keeps live log and removes lock",
+             (state / "live_anchors.jsonl").exists() and not (state / "gone_anchors.lock").exists())
+
+        # 3. Memory TTLs: expired deleted; future and no-TTL kept
+        write(memory / "project" / "p" / "expired.json", {"expiresAt": "2000-01-01T00:00:00Z", "v": 1})
+        write(memory / "project" / "p" / "future.json", {"expiresAt": "2999-01-01T00:00:00Z", "v": 1})
+        write(memory / "global" / "forever.json", {"v": 1})
+        write(memory / "session" / "late_key.json", {"v": "x" * 5000, "expiresAt": "2000-01-01T00:00:00Z"})
+        deleted, _ = dc.cleanup_memory()
+        remaining = sorted(p.name for p in memory.rglob("*.json"))
+        test("cleanup_memory deletes expired", deleted == 2 and remaining == ["forever.json", "future.json"],
+             f"got {deleted}, {remaining}")
+
+        # 4. Empty directories are removed bottom-up
+        (memory / "session" / "a" / "b").mkdir(parents=True)
+        removed = dc.cleanup_empty_dirs()
+        test("cleanup_empty_dirs", removed >= 3 and not (memory / "session").exists(), f"removed {removed}")
+
+        # 5. Over-limit anchor logs are trimmed to the most important anchors
+        write(state / "big_anchors.jsonl", b"".join(anchor_line(i, 5 if i < 50 else 1) for i in range(60)))
+        result = dc.enforce_limits()
+        kept = [json.loads(line) for line in (state / "big_anchors.jsonl").read_bytes().splitlines()]
+        test("enforce_limits trims anchor log",
+             result.anchors_deleted == 10 and len(kept) == 50 and all(a["importance"] == 5 for a in kept),
+             f"deleted {result.anchors_deleted}, kept {len(kept)}")
+
+        # 6. Over budget: oldest memory files go first
+        for i in range(3):
+            write(memory / "project" / f"blob{i}.json", {"v": "x" * 500_000}, age_days=3 - i)
+        (state / ".memory_size_hint").unlink(missing_ok=True)
+        result = dc.enforce_limits()
+        test("enforce_limits evicts oldest memory",
+             result.memory_deleted >= 1 and not (memory / "project" / "blob0.json").exists()
+             and (memory / "project" / "blob2.json").exists(),
+             f"deleted {result.memory_deleted}")
+
+        # 7. Stats and the run/should_run cycle
+        stats = dc.get_stats()
+        test("get_stats counts state files",
+             stats["sessions"]["count"] == 1 and stats["anchors"]["count"] == 2,
+             f"got {stats['sessions']}, {stats['anchors']}")
+        write(state / "big_anchors.jsonl", b"".join(anchor_line(i, 1) for i in range(60)))
+        result = dc.run(force=True)
+        test("run records last cleanup", not dc.should_run())
+        test("run enforces limits", result.anchors_deleted == 10, f"deleted {result.anchors_deleted}")
+
+
 def test_hook_wrapper_simulation():
     """Hook Wrapper simulation tests"""
     print("\n=== Hook Wrapper Simulation ===")
@@ -233,6 +465,90 @@ def test_hook_wrapper_simulation():
         test("import wrapper functions", False, str(e))
 
 
+def test_audit_logger():
+    """Completion AuditLogger writer thread tests"""
+    print("\n=== Audit Logger ===")
+
+    import time
+    from completion_orchestrator import AuditLogger
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = Path(tmp)
+
+        # 1. Queued events are written on close
+        logger = AuditLogger(log_dir=tmp, file_prefix="audit-test")
+        for i in range(3):
+            logger.log({"event_type": "test", "n": i})
+        logger.close()
+        files = list(log_dir.glob("audit-test-*.jsonl"))
+        lines = files[0].read_text(encoding="utf-8").splitlines() if files else []
+        events = [json.loads(line) for line in lines]
+        test("audit events written on close", [e["n"] for e in events] == [0, 1, 2], f"got {lines}")
+        test("audit events timestamped", all("timestamp" in e for e in events))
+
+        # 2. Writer survives a failed open after date rotation
+        logger = AuditLogger(log_dir=tmp, file_prefix="audit-rotate")
+        logger.log({"n": 1})
+        for _ in range(100):  # Let the writer open today's file first
+            if logger._fh is not None:
+                break
+            time.sleep(0.01)
+        logger.log_dir = log_dir / "missing"
+        logger._queue.put_nowait(("2099-01-01", {"n": 2}))
+        time.sleep(logger.FLUSH_INTERVAL_SEC * 3)
+        test("writer alive after failed rotation", logger._thread.is_alive())
+
+        logger.log_dir = log_dir
+        logger.log({"n": 3})
+        logger.close()
+        written = []
+        for f in log_dir.glob("audit-rotate-*.jsonl"):
+            written += [json.loads(line)["n"] for line in f.read_text(encoding="utf-8").splitlines()]
+        test("events after failed rotation written", sorted(written) == [1, 3], f"got {written}")
+
+
+def test_adapter_parsing():
+    """Adapter response parsing tests"""
+    print("\n=== Adapter Response Parsing ===")
+
+    from adapters.base import LLMAdapter, Severity, _extract_json_block
+
+    # 1. Fenced JSON block extraction
+    block = '{"description": "wrap it in ```code``` fences", "severity": "LOW"}'
+    test("json block with nested fence", _extract_json_block(f"```json\n{block}\n```") == block)
+
+    block = '{"description": "quote \\"}\\" and backslash \\\\", "severity": "HIGH"}'
+    test("json block with escaped quotes",
+         _extract_json_block(f"Result:\n```json\n{block}\n```\ndone") == block)
+
+    test("json block in bare fence", _extract_json_block('```\n{"a": {"b": 1}}\n```') == '{"a": {"b": 1}}')
+    test("unterminated json block", _extract_json_block('```json\n{"a": {"b": 1}\n') is None)
+    test("non-json fence", _extract_json_block('```python\nprint({"a": 1})\n```') is None)
+    test("no fence", _extract_json_block('{"a": 1}') is None)
+
+    # 2. parse_response: direct JSON, fenced JSON, text fallback
+    class StubAdapter(LLMAdapter):
+        def review(self, prompt, context):
+            raise NotImplementedError
+
+        def is_available(self):
+            return True
+
+    adapter = StubAdapter("stub", {})
+    result = adapter.parse_response('{"severity": "high", "issues": [{"description": "x", "severity": "LOW"}]}')
+    test("parse direct json", result.severity == Severity.HIGH and result.issues[0].severity == Severity.LOW)
+
+    result = adapter.parse_response('Review:\n```json\n{"severity": "CRITICAL", "issues": []}\n```')
+    test("parse fenced json", result.severity == Severity.CRITICAL)
+
+    result = adapter.parse_response("Found a minor issue and a bug")
+    test("parse text fallback", result.severity == Severity.HIGH and result.success)
+
+    # Unicode case variants must not match the ASCII keywords (or crash)
+    result = adapter.parse_response("cr\u0131tical \u017fecurity vulnerability")
+    test("text fallback ignores unicode case variants", result.severity == Severity.OK)
+
+
 def test_mcp_memory_tools():
     """MCP Memory Tools tests (TypeScript build required)"""
     print("\n=== MCP Memory Tools ===")
@@ -282,9 +598,13 @@ def main():
         # Run tests
         session_id = test_protected_context()
         test_semantic_anchors(session_id)
+        test_anchor_log()
         test_auto_recovery(session_id)
         test_cleanup()
+        test_cleanup_operations()
         test_hook_wrapper_simulation()
+        test_audit_logger()
+        test_adapter_parsing()
         test_mcp_memory_tools()
 
         # Cleanup test data